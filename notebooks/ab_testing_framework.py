@@ -3,13 +3,18 @@ A/B Testing Framework for Prompt Engineering
 Compare different prompt versions and track performance
 """
 
-import json
 import random
 import statistics
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+import codec
+import instrumentation
+from blob_store import BlobStore
+from segment_analysis import analyze_segments
+from traffic_assignment import assign_variant
+
 @dataclass
 class PromptTest:
     test_id: str
@@ -24,14 +29,22 @@ class TestResult:
     test_id: str
     prompt_version: str  # 'A' or 'B'
     score: float  # 1-10 scale
-    response_text: str
+    response_text: Optional[str]  # None when stored in a BlobStore
     timestamp: str
     notes: Optional[str] = None
+    response_ref: Optional[str] = None  # BlobStore reference
+    attributes: Optional[Dict[str, str]] = None  # segment keys, e.g. {'tier': 'pro', 'language': 'en'}
+
+_test_codec = codec.codec_for(PromptTest)
+_result_codec = codec.codec_for(TestResult)
 
 class PromptABTester:
-    def __init__(self):
+    def __init__(self, blob_store: BlobStore = None, result_log=None, storage_format: str = "json"):
         self.tests: Dict[str, PromptTest] = {}
         self.results: List[TestResult] = []
+        self.storage_format = storage_format  # 'json', 'compact' or 'binary' (see codec.py)
+        self.blob_store = blob_store  # keeps response texts out of memory and ab_test_data.json
+        self.result_log = result_log  # result_ingest.ResultLog shared by many processes
         self.load_data()
     
     def create_test(self, test_id: str, prompt_a: str, prompt_b: str, 
@@ -59,8 +72,25 @@ class PromptABTester:
         prompt = test.prompt_a if version == 'A' else test.prompt_b
         return version, prompt
     
+    def get_assigned_prompt(self, test_id: str, unit_id: str, traffic: float = 1.0,
+                            weights: Dict[str, float] = None,
+                            salt: str = "") -> Optional[Tuple[str, str]]:
+        """Get the sticky prompt version for a user (None if outside the traffic share)"""
+        if test_id not in self.tests:
+            raise ValueError(f"Test {test_id} not found")
+        if weights is not None and not set(weights) <= {'A', 'B'}:
+            raise ValueError(f"A/B tests only have arms 'A' and 'B', got {sorted(weights)}")
+        
+        version = assign_variant(test_id, unit_id, weights, traffic, salt)
+        if version is None:
+            return None
+        test = self.tests[test_id]
+        prompt = test.prompt_a if version == 'A' else test.prompt_b
+        return version, prompt
+    
+    @instrumentation.timed("ab_testing_record_result")
     def record_result(self, test_id: str, prompt_version: str, score: float, 
-                     response_text: str, notes: str = None):
+                     response_text: str, notes: str = None, attributes: Dict = None):
         """Record a test result"""
         result = TestResult(
             test_id=test_id,
@@ -68,11 +98,55 @@ class PromptABTester:
             score=score,
             response_text=response_text,
             timestamp=datetime.now().isoformat(),
-            notes=notes
+            notes=notes,
+            attributes=attributes
         )
-        self.results.append(result)
-        self.save_data()
+        self.record_results([result])
     
+    def record_results(self, results: List[TestResult]):
+        """Record many results with a single save"""
+        for result in results:
+            self._externalize(result)
+        self.results.extend(results)
+        if self.result_log is not None:
+            if self.blob_store is not None:
+                self.blob_store.flush()
+            self.result_log.append([_result_codec.encode(result) for result in results])
+        else:
+            self.save_data()
+    
+    def refresh_results(self):
+        """Reload results from the shared result log (a consistent snapshot)"""
+        if self.result_log is not None:
+            self.results = self.result_log.snapshot()
+    
+    def _externalize(self, result: TestResult):
+        """Move a result's response text into the blob store, keeping only the reference"""
+        if self.blob_store is not None and result.response_text is not None:
+            result.response_ref = self.blob_store.put(result.response_text)
+            result.response_text = None
+    
+    def get_response_text(self, result: TestResult) -> Optional[str]:
+        """Get a result's response text, loading it from the blob store if needed"""
+        if result.response_text is not None:
+            return result.response_text
+        if result.response_ref and self.blob_store is not None:
+            return self.blob_store.get(result.response_ref)
+        return None
+    
+    def export_results(self, test_id: str, include_text: bool = True) -> List[Dict]:
+        """Export a test's results as dicts, loading response texts lazily"""
+        exported = []
+        for result in self.results:
+            if result.test_id != test_id:
+                continue
+            row = asdict(result)
+            if include_text:
+                row["response_text"] = self.get_response_text(result)
+            exported.append(row)
+        return exported
+    
+    @instrumentation.timed("ab_testing_analyze_test")
     def analyze_test(self, test_id: str) -> Dict:
         """Analyze results for a specific test"""
         test_results = [r for r in self.results if r.test_id == test_id]
@@ -125,6 +199,12 @@ class PromptABTester:
         
         return analysis
     
+    def analyze_segments(self, test_id: str, by: List[str],
+                         numeric_buckets: Dict[str, List[float]] = None,
+                         alpha: float = 0.05) -> Dict:
+        """Analyze results per segment (e.g. by=['tier', 'language'])"""
+        return analyze_segments(self.results, test_id, by, numeric_buckets, alpha)
+    
     def generate_report(self, test_id: str) -> str:
         """Generate a formatted report for a test"""
         if test_id not in self.tests:
@@ -189,29 +269,51 @@ class PromptABTester:
     
     def save_data(self):
         """Save tests and results to file"""
+        if self.blob_store is not None:
+            for result in self.results:
+                self._externalize(result)
+            self.blob_store.flush()  # blobs must be on disk before references are
+        
         data = {
-            "tests": {tid: asdict(test) for tid, test in self.tests.items()},
-            "results": [asdict(result) for result in self.results]
+            "tests": {tid: _test_codec.encode(test) for tid, test in self.tests.items()},
+            "results": [] if self.result_log is not None else [_result_codec.encode(result) for result in self.results]
         }
-        with open("ab_test_data.json", "w") as f:
-            json.dump(data, f, indent=2)
+        instrumentation.record_write("ab_testing", codec.dump(data, "ab_test_data.json", self.storage_format))
     
     def load_data(self):
         """Load tests and results from file"""
         try:
-            with open("ab_test_data.json", "r") as f:
-                data = json.load(f)
+            data = codec.load("ab_test_data.json")
                 
             # Load tests
             for tid, test_data in data.get("tests", {}).items():
-                self.tests[tid] = PromptTest(**test_data)
+                self.tests[tid] = _test_codec.decode(test_data)
             
             # Load results
-            for result_data in data.get("results", []):
-                self.results.append(TestResult(**result_data))
+            self.results.extend(_result_codec.decode(r) for r in data.get("results", []))
                 
         except FileNotFoundError:
             pass  # No existing data
+        
+        if self.result_log is not None:
+            if self.results:
+                self._migrate_results()
+            self.refresh_results()
+    
+    def _migrate_results(self):
+        """Move results saved by older versions into the result log, exactly once.
+        
+        Holding the log's lock, re-read the data file: another process may
+        already have moved the results (and emptied the file's list).
+        """
+        with self.result_log.locked():
+            try:
+                legacy = codec.load("ab_test_data.json").get("results", [])
+            except FileNotFoundError:
+                legacy = []
+            if legacy:
+                self.result_log.append(legacy)
+                self.save_data()
 
 # Example usage and demo
 if __name__ == "__main__":
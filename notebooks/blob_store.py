@@ -0,0 +1,168 @@
+"""
+Compressed Blob Store for Model Responses
+Deduplicated, append-only storage so results only keep a small reference
+"""
+
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import zstandard  # optional, faster and smaller than zlib
+except ImportError:
+    zstandard = None
+
+# Frame layout: magic (2) | codec (1) | sha256 digest (32) | payload length (4) | payload
+FRAME_HEADER = struct.Struct(">2sc32sI")
+FRAME_MAGIC = b"PB"
+CODEC_ZLIB = b"z"
+CODEC_ZSTD = b"s"
+
+
+class BlobStore:
+    """Content-addressed text store in a single append-only segment file.
+
+    `put` returns the SHA-256 hex digest of the text, which is the reference
+    kept by callers; identical texts are stored once. The index of digest ->
+    offset is rebuilt by scanning frame headers when the store is opened, and
+    extended from where the last scan stopped when `get` misses, so readers
+    see frames appended later by the writer.
+
+    One process writes a segment (e.g. the ResultIngestionService writer)
+    while any number read it. Scans stop at an incomplete final frame, which
+    may still be being written; only the first `put` cuts such a torn tail,
+    left by a crashed writer, before appending.
+    """
+
+    def __init__(self, path: str = "ab_test_blobs.seg", compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+        self.index: Dict[str, Tuple[int, int, bytes]] = {}  # digest -> (offset, length, codec)
+        self._scanned_to = 0  # end of the last complete frame indexed
+        self._lock = threading.Lock()
+        self._writer = None  # opened by the first put
+        self._reader = None
+        self._scan()
+
+    def _scan(self):
+        """Index complete frames appended since the last scan, stopping at an incomplete one"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(self._scanned_to)
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+                magic, codec, digest, length = FRAME_HEADER.unpack(header)
+                offset = f.tell()
+                if magic != FRAME_MAGIC or offset + length > size:
+                    break
+                self.index[digest.hex()] = (offset, length, codec)
+                f.seek(length, os.SEEK_CUR)
+                self._scanned_to = offset + length
+
+    def _open_writer(self):
+        """Cut a torn tail left by a crashed writer, then open the segment for appending"""
+        self._scan()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self._scanned_to:
+            with open(self.path, "r+b") as f:
+                f.truncate(self._scanned_to)
+        self._writer = open(self.path, "ab")
+
+    def _compress(self, data: bytes) -> Tuple[bytes, bytes]:
+        if zstandard is not None:
+            return CODEC_ZSTD, zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return CODEC_ZLIB, zlib.compress(data, self.compression_level)
+
+    @staticmethod
+    def _decompress(codec: bytes, payload: bytes) -> bytes:
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("This blob was written with zstd; install 'zstandard' to read it")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
+
+    def put(self, text: str) -> str:
+        """Store a text (once per distinct content) and return its reference"""
+        data = text.encode()
+        digest = hashlib.sha256(data).digest()
+        ref = digest.hex()
+        with self._lock:
+            if ref in self.index:
+                return ref
+            if self._writer is None:
+                self._open_writer()
+            codec, payload = self._compress(data)
+            self._writer.seek(0, os.SEEK_END)
+            offset = self._writer.tell() + FRAME_HEADER.size
+            self._writer.write(FRAME_HEADER.pack(FRAME_MAGIC, codec, digest, len(payload)))
+            self._writer.write(payload)
+            self.index[ref] = (offset, len(payload), codec)
+            self._scanned_to = offset + len(payload)
+        return ref
+
+    def put_many(self, texts: Iterable[str]) -> list:
+        """Store several texts and flush once"""
+        refs = [self.put(text) for text in texts]
+        self.flush()
+        return refs
+
+    def get(self, ref: str) -> Optional[str]:
+        """Load a text by reference (None if unknown)"""
+        with self._lock:
+            entry = self.index.get(ref)
+            if entry is None:
+                self._scan()  # appended by the writer since the last scan?
+                entry = self.index.get(ref)
+                if entry is None:
+                    return None
+            offset, length, codec = entry
+            if self._writer is not None:
+                self._writer.flush()
+            if self._reader is None:
+                self._reader = open(self.path, "rb")
+            self._reader.seek(offset)
+            payload = self._reader.read(length)
+        return self._decompress(codec, payload).decode()
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self.index
+
+    def flush(self):
+        """Make appended frames visible to other readers of the segment"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def get_stats(self) -> Dict:
+        self.flush()
+        return {
+            "blobs": len(self.index),
+            "segment_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "codec": "zstd" if zstandard is not None else "zlib"
+        }
+
+    def close(self):
+        with self._lock:
+            for f in (self._writer, self._reader):
+                if f is not None:
+                    f.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    store = BlobStore("demo_blobs.seg")
+    long_response = "Dear customer, thank you for reaching out. " * 50
+    ref1 = store.put(long_response)
+    ref2 = store.put(long_response)  # deduplicated
+    store.flush()
+
+    print("Same reference:", ref1 == ref2)
+    print("Round trip:", store.get(ref1) == long_response)
+    print("Stats:", store.get_stats(), "raw size:", len(long_response.encode()))
+    store.close()
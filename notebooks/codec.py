@@ -0,0 +1,167 @@
+"""
+Serialization Codecs for Course Data Files
+Shared encoders/decoders and file formats for every persisted store
+"""
+
+import json
+import os
+import tempfile
+import zlib
+from dataclasses import MISSING, fields
+from operator import attrgetter
+from typing import Any, Dict, Type
+
+try:
+    import orjson  # optional, much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+FORMATS = ("json", "compact", "binary")
+BINARY_MAGIC = b"PECB\x01"  # header of binary files: magic + zlib-compressed compact JSON
+
+_new_file_mode = None  # 0o666 minus the umask, read once by _default_mode
+
+
+class DataclassCodec:
+    """Precompiled dict encoder/decoder for one dataclass.
+
+    Unlike dataclasses.asdict this does not recurse or deep-copy: field
+    values are already plain JSON types (str, float, dict, list) for every
+    persisted dataclass in this course.
+    """
+
+    def __init__(self, cls: Type):
+        self.cls = cls
+        self.names = tuple(f.name for f in fields(cls))
+        self._getter = attrgetter(*self.names)
+        self._defaults = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+        self._required = frozenset(
+            f.name for f in fields(cls) if f.default is MISSING and f.default_factory is MISSING
+        )
+        self._fast_decode = (
+            not hasattr(cls, "__post_init__")
+            and all(f.default_factory is MISSING for f in fields(cls))
+        )
+
+    def encode(self, obj) -> Dict[str, Any]:
+        values = self._getter(obj)
+        if len(self.names) == 1:
+            values = (values,)
+        return dict(zip(self.names, values))
+
+    def decode(self, data: Dict[str, Any]):
+        if not self._fast_decode or not self._required.issubset(data) or not set(data).issubset(self.names):
+            return self.cls(**data)  # let the dataclass raise its usual errors
+        obj = self.cls.__new__(self.cls)
+        obj.__dict__.update(self._defaults)
+        obj.__dict__.update(data)
+        return obj
+
+
+_codecs: Dict[Type, DataclassCodec] = {}
+
+
+def codec_for(cls: Type) -> DataclassCodec:
+    """Get the (cached) codec for a dataclass"""
+    codec = _codecs.get(cls)
+    if codec is None:
+        codec = _codecs[cls] = DataclassCodec(cls)
+    return codec
+
+
+def dumps(data: Any, fmt: str = "json") -> bytes:
+    """Serialize data in one of FORMATS"""
+    if fmt == "json":
+        return json.dumps(data, indent=2).encode()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown storage format '{fmt}'. Use one of {FORMATS}")
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode()
+    if fmt == "binary":
+        return BINARY_MAGIC + zlib.compress(payload, 1)
+    return payload
+
+
+def loads(raw: bytes) -> Any:
+    """Parse data written in any of FORMATS (detected from the content)"""
+    if raw.startswith(BINARY_MAGIC):
+        raw = zlib.decompress(raw[len(BINARY_MAGIC):])
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by the json module; fall back to it
+    return json.loads(raw)
+
+
+def _default_mode(directory: str) -> int:
+    """Mode open() would give a new file, found without changing the process umask"""
+    global _new_file_mode
+    if _new_file_mode is None:
+        try:
+            with open("/proc/self/status") as f:  # Linux reports the umask here
+                umask = next(int(line.split()[1], 8) for line in f if line.startswith("Umask:"))
+            _new_file_mode = 0o666 & ~umask
+        except (OSError, StopIteration, ValueError, IndexError):
+            fd, probe = tempfile.mkstemp(dir=directory, suffix=".probe")
+            os.close(fd)
+            os.unlink(probe)
+            fd = os.open(probe, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            try:
+                _new_file_mode = os.fstat(fd).st_mode & 0o777
+            finally:
+                os.close(fd)
+                os.unlink(probe)
+    return _new_file_mode
+
+
+def dump(data: Any, path, fmt: str = "json") -> int:
+    """Atomically write data to path (temp file + rename); returns bytes written"""
+    payload = dumps(data, fmt)
+    directory = os.path.dirname(os.fspath(path)) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        try:
+            mode = os.stat(path).st_mode & 0o7777  # keep an existing file's permissions
+        except FileNotFoundError:
+            mode = _default_mode(directory)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(payload)
+
+
+def load(path) -> Any:
+    """Read a data file in any supported format (raises FileNotFoundError)"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from dataclasses import asdict
+    from ab_testing_framework import TestResult
+
+    results = [TestResult("demo", "AB"[i % 2], 5.0 + i % 5, f"response {i}", "2026-10-19T12:00:00")
+               for i in range(100000)]
+    codec = codec_for(TestResult)
+
+    started = time.perf_counter()
+    legacy = json.dumps([asdict(r) for r in results], indent=2)
+    print(f"asdict + indent=2: {time.perf_counter() - started:.3f}s, {len(legacy):,} bytes")
+
+    for fmt in FORMATS:
+        started = time.perf_counter()
+        raw = dumps([codec.encode(r) for r in results], fmt)
+        encoded = time.perf_counter() - started
+        started = time.perf_counter()
+        decoded = [codec.decode(d) for d in loads(raw)]
+        print(f"{fmt:8s}: encode {encoded:.3f}s, decode {time.perf_counter() - started:.3f}s, "
+              f"{len(raw):,} bytes, round trip ok: {decoded == results}")
@@ -0,0 +1,276 @@
+"""
+Cohort Progress Store for Prompt Engineering Course
+Keeps progress for thousands of students in one SQLite database
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from progress_tracker import MASTERY_THRESHOLD, SKILLS_MATRIX_TEMPLATE, ProgressTracker
+
+WEEK_COMPLETION_THRESHOLD = 0.8  # same rule as generate_certificate / _get_next_milestone
+
+
+class CohortProgressStore:
+    """Multi-student progress store.
+
+    Student records are keyed by student_id, so loading one student is a
+    primary-key lookup. Skill scores are also kept as rows of a `skills`
+    table, which lets cohort-wide analytics run as SQL aggregates over all
+    students at once instead of instantiating a tracker per student.
+
+    Pass an instance to ProgressTracker(store=..., student_id=...).
+    """
+
+    def __init__(self, path: str = "cohort_progress.sqlite"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS students (
+                student_id TEXT PRIMARY KEY,
+                student_name TEXT NOT NULL,
+                last_updated TEXT NOT NULL,
+                skills_matrix TEXT NOT NULL,
+                assessments TEXT NOT NULL,
+                projects TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS skills (
+                student_id TEXT NOT NULL,
+                week TEXT NOT NULL,
+                skill TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (student_id, week, skill)
+            );
+            CREATE INDEX IF NOT EXISTS idx_skills_week_skill ON skills (week, skill);
+            CREATE TABLE IF NOT EXISTS weeks (week TEXT PRIMARY KEY, position INTEGER NOT NULL);
+        """)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO weeks VALUES (?, ?)",
+            [(week, i) for i, week in enumerate(SKILLS_MATRIX_TEMPLATE)]
+        )
+        self._conn.commit()
+
+    def load(self, student_id: str) -> Optional[Dict]:
+        """Load one student's progress data (same shape as progress.json)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT student_name, last_updated, skills_matrix, assessments, projects "
+                "FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'student_name': row[0],
+            'last_updated': row[1],
+            'skills_matrix': json.loads(row[2]),
+            'assessments': json.loads(row[3]),
+            'projects': json.loads(row[4])
+        }
+
+    def load_many(self, student_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Load several students at once; unknown ids are left out"""
+        ids = list(student_ids)
+        loaded = {}
+        for start in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+            batch = ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT student_id, student_name, last_updated, skills_matrix, assessments, projects "
+                    f"FROM students WHERE student_id IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+            for student_id, name, updated, skills, assessments, projects in rows:
+                loaded[student_id] = {
+                    'student_name': name,
+                    'last_updated': updated,
+                    'skills_matrix': json.loads(skills),
+                    'assessments': json.loads(assessments),
+                    'projects': json.loads(projects)
+                }
+        return loaded
+
+    def save(self, student_id: str, data: Dict):
+        """Insert or replace one student's progress"""
+        self.save_many([(student_id, data)])
+
+    def save_many(self, records: Iterable[Tuple[str, Dict]]):
+        """Insert or replace many students in a single transaction"""
+        student_rows, skill_rows = [], []
+        for student_id, data in records:
+            student_rows.append((
+                student_id, data['student_name'], data['last_updated'],
+                json.dumps(data['skills_matrix'], separators=(',', ':')),
+                json.dumps(data['assessments'], separators=(',', ':')),
+                json.dumps(data['projects'], separators=(',', ':'))
+            ))
+            skill_rows.extend(
+                (student_id, week, skill, score)
+                for week, skills in data['skills_matrix'].items()
+                for skill, score in skills.items()
+            )
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?, ?, ?)", student_rows)
+            self._conn.executemany("INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?)", skill_rows)
+
+    def save_trackers(self, trackers: Iterable[ProgressTracker]):
+        """Save many trackers backed by this store in a single transaction
+        (e.g. write-behind trackers after a batch of updates)"""
+        trackers = [t for t in trackers if t.dirty]
+        self.save_many((t.student_id, t.progress_data()) for t in trackers)
+        for t in trackers:
+            t.mark_saved()
+
+    def tracker(self, student_id: str, student_name: str = None, **kwargs) -> ProgressTracker:
+        """Open a ProgressTracker backed by this store"""
+        if student_name is None:
+            data = self.load(student_id)
+            student_name = data['student_name'] if data else student_id
+        return ProgressTracker(student_name, store=self, student_id=student_id, **kwargs)
+
+    def iter_students(self, batch_size: int = 1000) -> Iterator[Tuple[str, Dict]]:
+        """Stream (student_id, progress data) for the whole cohort in key order"""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT student_id FROM students WHERE student_id > ? ORDER BY student_id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for (student_id,) in rows:
+                yield student_id, self.load(student_id)
+            last_id = rows[-1][0]
+
+    def student_ids(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT student_id FROM students ORDER BY student_id")]
+
+    def count_students(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    # ---- Cohort analytics -------------------------------------------------
+
+    def skill_mastery_distribution(self) -> List[Dict]:
+        """Per skill: students, mean score, mastery rate and score histogram"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT s.week, s.skill, COUNT(*), AVG(s.score),
+                       SUM(s.score >= :mastery),
+                       SUM(s.score = 0),
+                       SUM(s.score > 0 AND s.score < 0.4),
+                       SUM(s.score >= 0.4 AND s.score < :mastery),
+                       SUM(s.score >= :mastery)
+                FROM skills s JOIN weeks w ON w.week = s.week
+                GROUP BY s.week, s.skill
+                ORDER BY w.position, s.skill
+            """, {"mastery": MASTERY_THRESHOLD}).fetchall()
+        return [{
+            "week": week,
+            "skill": skill,
+            "students": students,
+            "mean_score": round(mean, 3),
+            "mastery_rate": round(mastered / students, 3),
+            "histogram": {"not_started": h0, "beginning": h1, "developing": h2, "mastered": h3}
+        } for week, skill, students, mean, mastered, h0, h1, h2, h3 in rows]
+
+    def _week_ratios_sql(self) -> str:
+        return """
+            SELECT s.student_id, s.week, w.position,
+                   AVG(s.score >= :mastery) AS mastered_ratio
+            FROM skills s JOIN weeks w ON w.week = s.week
+            GROUP BY s.student_id, s.week
+        """
+
+    def week_completion_rates(self) -> Dict[str, Dict]:
+        """Share of students with at least 80% of a week's skills mastered"""
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT week, COUNT(*), SUM(mastered_ratio >= :complete)
+                FROM ({self._week_ratios_sql()})
+                GROUP BY week ORDER BY MIN(position)
+            """, {"mastery": MASTERY_THRESHOLD, "complete": WEEK_COMPLETION_THRESHOLD}).fetchall()
+        return {
+            week: {"students": students, "completed": completed,
+                   "completion_rate": round(completed / students, 3)}
+            for week, students, completed in rows
+        }
+
+    def milestone_counts(self) -> Dict[str, int]:
+        """How many students are currently on each milestone (first incomplete week)"""
+        with self._lock:
+            rows = self._conn.execute(f"""
+                WITH ratios AS ({self._week_ratios_sql()}),
+                firsts AS (
+                    SELECT student_id, MIN(position) AS position FROM ratios
+                    WHERE mastered_ratio < :complete GROUP BY student_id
+                )
+                SELECT COALESCE(w.week, 'complete'), COUNT(*) FROM students st
+                LEFT JOIN firsts f ON f.student_id = st.student_id
+                LEFT JOIN weeks w ON w.position = f.position
+                GROUP BY 1
+            """, {"mastery": MASTERY_THRESHOLD, "complete": WEEK_COMPLETION_THRESHOLD}).fetchall()
+        return dict(rows)
+
+    def students_stuck_on(self, week: str, inactive_since: str = None) -> List[str]:
+        """Students whose next milestone is `week`, optionally with no update since a date"""
+        query = f"""
+            WITH ratios AS ({self._week_ratios_sql()}),
+            firsts AS (
+                SELECT student_id, MIN(position) AS position FROM ratios
+                WHERE mastered_ratio < :complete GROUP BY student_id
+            )
+            SELECT st.student_id FROM firsts f
+            JOIN weeks w ON w.position = f.position
+            JOIN students st ON st.student_id = f.student_id
+            WHERE w.week = :week AND (:since IS NULL OR st.last_updated < :since)
+            ORDER BY st.student_id
+        """
+        with self._lock:
+            rows = self._conn.execute(query, {
+                "mastery": MASTERY_THRESHOLD, "complete": WEEK_COMPLETION_THRESHOLD,
+                "week": week, "since": inactive_since
+            }).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import random
+
+    if os.path.exists("demo_cohort.sqlite"):
+        os.remove("demo_cohort.sqlite")
+    store = CohortProgressStore("demo_cohort.sqlite")
+
+    rng = random.Random(1)
+    records = []
+    for i in range(5000):
+        tracker_data = {
+            'student_name': f"Student {i}",
+            'last_updated': f"2026-10-{rng.randint(1, 19):02d}T12:00:00",
+            'skills_matrix': {week: {skill: round(rng.random(), 2) for skill in skills}
+                              for week, skills in SKILLS_MATRIX_TEMPLATE.items()},
+            'assessments': {},
+            'projects': {}
+        }
+        records.append((f"s{i:05d}", tracker_data))
+    store.save_many(records)
+
+    tracker = store.tracker("s00042")
+    tracker.update_skill("week1_foundations", "prompt_debugging", 1.0)
+    print("One student:", tracker.student_name, tracker.get_overall_progress())
+
+    print("Week completion:", store.week_completion_rates())
+    print("Milestones:", store.milestone_counts())
+    print("Stuck on week 1 since Oct 5:", len(store.students_stuck_on("week1_foundations", "2026-10-05")))
+    print("Mastery:", store.skill_mastery_distribution()[0])
@@ -0,0 +1,259 @@
+"""
+Concurrent Experiment Runner for Prompt A/B Tests
+Runs both prompt versions over a dataset of inputs through a model backend
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ab_testing_framework import PromptABTester, TestResult
+from response_cache import ResponseCache
+
+
+class ModelBackend:
+    """Interface for anything that turns (prompt, input) into a response"""
+    name = "base"
+
+    async def generate(self, prompt: str, input_text: str, **params) -> str:
+        raise NotImplementedError
+
+
+class LocalStubBackend(ModelBackend):
+    """Deterministic offline backend for tests and dry runs.
+
+    The same (prompt, input) always gives the same response. `failure_rate`
+    makes a deterministic share of first attempts fail, to exercise retries.
+    """
+    name = "local_stub"
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._failed = set()
+
+    async def generate(self, prompt: str, input_text: str, **params) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        digest = hashlib.md5(f"{prompt}\n{input_text}".encode()).hexdigest()
+        if digest not in self._failed and int(digest[:4], 16) / 0xFFFF < self.failure_rate:
+            self._failed.add(digest)
+            raise RuntimeError(f"Simulated backend failure for {digest[:8]}")
+        return f"[{digest[:8]}] {prompt[:40]} -> {input_text}"
+
+
+class OpenAIBackend(ModelBackend):
+    """Chat completion backend (the prompt is sent as the system message)"""
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4o-mini", **client_kwargs):
+        from openai import AsyncOpenAI  # only needed when this backend is used
+        self.model = model
+        self.client = AsyncOpenAI(**client_kwargs)
+
+    async def generate(self, prompt: str, input_text: str, **params) -> str:
+        response = await self.client.chat.completions.create(
+            model=params.pop("model", self.model),
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": input_text},
+            ],
+            **params,
+        )
+        return response.choices[0].message.content or ""
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter (`rate` requests per second)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class ExperimentRunner:
+    """Dispatch both arms of an A/B test over many inputs concurrently.
+
+    `grader(prompt, input_text, response) -> float` (sync or async) scores each
+    response on the test's 1-10 scale; graded results are written to the tester
+    in batches of `batch_size`. Without a grader, responses are only returned.
+    When a `cache` is given it is consulted before every backend call.
+    """
+
+    def __init__(self, tester: PromptABTester, backend: ModelBackend,
+                 grader: Callable = None, max_concurrency: int = 16,
+                 rate_limit: float = None, max_retries: int = 3,
+                 backoff_base: float = 0.5, batch_size: int = 1000,
+                 model_params: Dict = None, cache: ResponseCache = None):
+        self.tester = tester
+        self.backend = backend
+        self.grader = grader
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.batch_size = batch_size
+        self.model_params = model_params or {}
+        self.cache = cache
+
+    async def run(self, test_id: str, inputs: Iterable[str]) -> Dict:
+        """Run every input through prompt A and prompt B"""
+        if test_id not in self.tester.tests:
+            raise ValueError(f"Test {test_id} not found")
+
+        test = self.tester.tests[test_id]
+        jobs = iter(
+            (index, version, prompt, input_text)
+            for index, input_text in enumerate(inputs)
+            for version, prompt in (("A", test.prompt_a), ("B", test.prompt_b))
+        )
+        limiter = TokenBucket(self.rate_limit) if self.rate_limit else None
+        pending: List[TestResult] = []
+        responses: List[Dict] = []
+        stats = {"completed": 0, "failed": 0, "retries": 0, "cache_hits": 0, "errors": []}
+        started = time.perf_counter()
+
+        flush_lock = asyncio.Lock()  # one save at a time, in submission order
+
+        async def flush():
+            batch = list(pending)
+            pending.clear()
+            async with flush_lock:
+                await self._flush(batch)
+
+        async def worker():
+            for index, version, prompt, input_text in jobs:
+                response = await self._call_with_retries(prompt, input_text, limiter, stats)
+                if response is None:
+                    stats["failed"] += 1
+                    continue
+
+                if self.grader is None:
+                    stats["completed"] += 1
+                    responses.append({"input_index": index, "prompt_version": version,
+                                      "response_text": response})
+                    continue
+
+                try:
+                    score = self.grader(prompt, input_text, response)
+                    if asyncio.iscoroutine(score):
+                        score = await score
+                    score = float(score)
+                except Exception as e:  # one bad grade must not discard the paid-for calls
+                    stats["failed"] += 1
+                    stats["errors"].append(f"grader: {e}")
+                    continue
+                stats["completed"] += 1
+                pending.append(TestResult(
+                    test_id=test_id,
+                    prompt_version=version,
+                    score=score,
+                    response_text=response,
+                    timestamp=datetime.now().isoformat(),
+                    notes=f"input #{index} via {self.backend.name}"
+                ))
+                if len(pending) >= self.batch_size:
+                    await flush()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        finally:
+            await flush()
+
+        elapsed = time.perf_counter() - started
+        calls = stats["completed"] + stats["failed"]
+        return {
+            "test_id": test_id,
+            "calls": calls,
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "retries": stats["retries"],
+            "cache_hits": stats["cache_hits"],
+            "errors": stats["errors"][:10],
+            "elapsed_seconds": round(elapsed, 3),
+            "calls_per_second": round(calls / elapsed, 1) if elapsed > 0 else None,
+            "responses": responses
+        }
+
+    def run_sync(self, test_id: str, inputs: Iterable[str]) -> Dict:
+        """Blocking wrapper around run() for scripts and notebooks"""
+        return asyncio.run(self.run(test_id, inputs))
+
+    async def _call_with_retries(self, prompt: str, input_text: str,
+                                 limiter: Optional[TokenBucket], stats: Dict) -> Optional[str]:
+        cache_params = {"backend": self.backend.name,
+                        "model": getattr(self.backend, "model", None), **self.model_params}
+        if self.cache:  # SQLite calls block, so they run off the event loop
+            cached = await asyncio.to_thread(self.cache.get, prompt, input_text, cache_params)
+            if cached is not None:
+                stats["cache_hits"] += 1
+                return cached
+
+        for attempt in range(self.max_retries + 1):
+            if limiter:
+                await limiter.acquire()
+            try:
+                response = await self.backend.generate(prompt, input_text, **dict(self.model_params))
+                if self.cache:
+                    await asyncio.to_thread(self.cache.put, prompt, input_text, response, cache_params)
+                return response
+            except Exception as e:
+                if attempt == self.max_retries:
+                    stats["errors"].append(str(e))
+                    return None
+                stats["retries"] += 1
+                delay = self.backoff_base * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+        return None
+
+    async def _flush(self, results: List[TestResult]):
+        """Write buffered results in one save, off the event loop"""
+        if results:
+            await asyncio.to_thread(self.tester.record_results, results)
+
+
+# Example usage
+if __name__ == "__main__":
+    tester = PromptABTester()
+    if "runner_demo" not in tester.tests:
+        tester.create_test(
+            test_id="runner_demo",
+            prompt_a="Summarize the ticket",
+            prompt_b="You are a support lead. Summarize the ticket in 2 sentences for an engineer.",
+            metric="quality",
+            description="Runner demo with the local stub backend"
+        )
+
+    runner = ExperimentRunner(
+        tester,
+        LocalStubBackend(failure_rate=0.05),
+        grader=lambda prompt, input_text, response: min(10.0, len(prompt) / 10),
+        max_concurrency=32,
+        backoff_base=0.01
+    )
+    summary = runner.run_sync("runner_demo", [f"Ticket {i}: login fails" for i in range(500)])
+    summary.pop("responses")
+    print("Run summary:", summary)
+    print(tester.generate_report("runner_demo"))
@@ -0,0 +1,200 @@
+"""
+Gradebook Importer for Prompt Engineering Course
+Streams LMS gradebook exports (CSV or JSONL) into the cohort progress store
+"""
+
+import copy
+import csv
+import datetime
+import json
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cohort_store import CohortProgressStore
+from progress_events import ProgressView
+from progress_tracker import MASTERY_THRESHOLD, SKILLS_MATRIX_TEMPLATE
+
+# Expected columns: student_id, week, kind ('skill' or 'assessment'), name, score
+# Optional columns: student_name, date, details (JSON object)
+REQUIRED_COLUMNS = ("student_id", "week", "kind", "name", "score")
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line_number, row) from a .csv or .jsonl gradebook export"""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, {"_error": f"invalid JSON: {e.msg}"}
+                    continue
+                if not isinstance(row, dict):
+                    row = {"_error": "row is not a JSON object"}
+                yield line_no, row
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def validate_row(row: Dict) -> Optional[str]:
+    """Return why a row is rejected, or None if it is valid"""
+    if "_error" in row:
+        return row["_error"]
+    missing = [c for c in REQUIRED_COLUMNS if row.get(c) in (None, "")]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    not_text = [c for c in ("student_id", "week", "kind", "name") if not isinstance(row[c], str)]
+    if not_text:
+        return f"{', '.join(not_text)} must be text"
+    week = row["week"]
+    if week not in SKILLS_MATRIX_TEMPLATE:
+        return f"unknown week '{week}'"
+    if row["kind"] == "skill":
+        if row["name"] not in SKILLS_MATRIX_TEMPLATE[week]:
+            return f"unknown skill '{row['name']}' for {week}"
+    elif row["kind"] != "assessment":
+        return f"unknown kind '{row['kind']}'"
+    try:
+        score = float(row["score"])
+    except (TypeError, ValueError):
+        return f"score '{row['score']}' is not a number"
+    if not 0 <= score <= 1:
+        return f"score {score} outside 0-1"
+    details = row.get("details")
+    if isinstance(details, str) and details:
+        try:
+            details = row["details"] = json.loads(details)
+        except json.JSONDecodeError:
+            return "details is not valid JSON"
+    if details not in (None, "") and not isinstance(details, dict):
+        return "details is not a JSON object"
+    return None
+
+
+class GradebookImporter:
+    """Apply gradebook rows to a CohortProgressStore in chunked transactions.
+
+    Rows are validated against the weeks and skills in the skills matrix,
+    grouped by student within each chunk, applied in memory with the same
+    rules as ProgressTracker (skills keep their best score) and saved with
+    one transaction per chunk. Memory is bounded by `chunk_size`.
+    """
+
+    def __init__(self, store: CohortProgressStore, chunk_size: int = 50000,
+                 rejects_path: str = None, max_rejects_kept: int = 100):
+        self.store = store
+        self.chunk_size = chunk_size
+        self.rejects_path = rejects_path
+        self.max_rejects_kept = max_rejects_kept
+
+    def import_file(self, path: str) -> Dict:
+        """Import one export file and return a summary"""
+        return self.import_rows(read_rows(path), source=path)
+
+    def import_rows(self, rows: Iterable[Tuple[int, Dict]], source: str = "<rows>") -> Dict:
+        summary = {"source": source, "rows": 0, "applied": 0, "rejected": 0,
+                   "student_saves": 0, "chunks": 0, "rejects": []}
+        started = time.perf_counter()
+        rejects_file = open(self.rejects_path, "w", encoding="utf-8") if self.rejects_path else None
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                valid = []
+                for line_no, row in chunk:
+                    reason = validate_row(row)
+                    if reason is None:
+                        valid.append(row)
+                        continue
+                    summary["rejected"] += 1
+                    reject = {"line": line_no, "reason": reason, "row": row}
+                    if len(summary["rejects"]) < self.max_rejects_kept:
+                        summary["rejects"].append(reject)
+                    if rejects_file:
+                        rejects_file.write(json.dumps(reject) + "\n")
+                summary["rows"] += len(chunk)
+                summary["student_saves"] += self._apply_chunk(valid)
+                summary["applied"] += len(valid)
+                summary["chunks"] += 1
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        elapsed = time.perf_counter() - started
+        summary["seconds"] = round(elapsed, 3)
+        summary["rows_per_second"] = round(summary["rows"] / elapsed, 1) if elapsed > 0 else None
+        return summary
+
+    def _apply_chunk(self, rows: List[Dict]) -> int:
+        """Apply a chunk of valid rows and save every touched student in one transaction"""
+        by_student: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_student.setdefault(row["student_id"], []).append(row)
+        if not by_student:
+            return 0
+
+        existing = self.store.load_many(by_student)
+        now = datetime.datetime.now().isoformat()
+        updated = []
+        for student_id, student_rows in by_student.items():
+            data = existing.get(student_id) or {
+                'student_name': student_rows[0].get("student_name") or student_id,
+                'skills_matrix': copy.deepcopy(SKILLS_MATRIX_TEMPLATE),
+                'assessments': {},
+                'projects': {}
+            }
+            for week, skills in SKILLS_MATRIX_TEMPLATE.items():  # records saved before a skill existed
+                for skill, default in skills.items():
+                    data['skills_matrix'].setdefault(week, {}).setdefault(skill, default)
+            view = ProgressView(data['skills_matrix'], data['assessments'], data['projects'],
+                                mastery_threshold=MASTERY_THRESHOLD)
+            for row in student_rows:
+                score = float(row["score"])
+                if row["kind"] == "skill":
+                    view.apply_skill(row["week"], row["name"], score)
+                else:
+                    view.apply_assessment(row["week"], row["name"], score,
+                                          row.get("date") or now, row.get("details") or {})
+            data['last_updated'] = now
+            updated.append((student_id, data))
+
+        self.store.save_many(updated)
+        return len(updated)
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import random
+
+    for path in ("demo_gradebook.csv", "demo_cohort.sqlite"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    rng = random.Random(11)
+    weeks = list(SKILLS_MATRIX_TEMPLATE)
+    with open("demo_gradebook.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "student_name", "week", "kind", "name", "score"])
+        for i in range(200000):
+            sid = f"s{rng.randint(0, 9999):05d}"
+            week = rng.choice(weeks)
+            if rng.random() < 0.8:
+                writer.writerow([sid, f"Student {sid}", week, "skill",
+                                 rng.choice(list(SKILLS_MATRIX_TEMPLATE[week])), round(rng.random(), 2)])
+            else:
+                writer.writerow([sid, f"Student {sid}", week, "assessment", "weekly_quiz", round(rng.random(), 2)])
+        writer.writerow(["s00001", "", "week9_unknown", "skill", "x", 0.5])  # rejected
+
+    store = CohortProgressStore("demo_cohort.sqlite")
+    summary = GradebookImporter(store).import_file("demo_gradebook.csv")
+    print({k: v for k, v in summary.items() if k != "rejects"})
+    print("First reject:", summary["rejects"][:1])
+    print("Week completion:", store.week_completion_rates())
@@ -0,0 +1,201 @@
+"""
+Performance Instrumentation for the Course Tools
+Opt-in timers, counters and gauges, exportable as Prometheus text or JSON
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = os.environ.get("PROMPT_METRICS", "") not in ("", "0", "false")
+_lock = threading.Lock()
+_histograms: Dict[str, "Histogram"] = {}
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+_help: Dict[str, str] = {}
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": cumulative
+        }
+
+
+def enable():
+    """Start recording metrics (also enabled by PROMPT_METRICS=1)"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Drop every recorded metric"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
+        _help.clear()
+
+
+def observe(name: str, seconds: float, help_text: str = None):
+    """Record one latency observation for `name`"""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+            if help_text:
+                _help[name] = help_text
+        histogram.observe(seconds)
+
+
+def count(name: str, value: float = 1):
+    """Increase a counter"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: float):
+    """Set a gauge to its current value"""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[name] = value
+
+
+def record_write(store: str, nbytes: int):
+    """Track a full-file save: bytes written so far and the file's current size"""
+    if not _enabled:
+        return
+    count(f"{store}_bytes_written_total", nbytes)
+    set_gauge(f"{store}_file_size_bytes", nbytes)
+
+
+def timed(name: str):
+    """Decorator recording call latency (and thus call count) as `<name>_seconds`.
+
+    When instrumentation is disabled the only overhead is one flag check.
+    """
+    metric = f"{name}_seconds"
+
+    def decorator(func):
+        help_text = f"Latency of {func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(metric, time.perf_counter() - started, help_text)
+        return wrapper
+    return decorator
+
+
+def _snapshot() -> Dict:
+    """Copy of every metric (the caller holds _lock)"""
+    return {
+        "timestamp": time.time(),
+        "histograms": {name: h.to_dict() for name, h in sorted(_histograms.items())},
+        "counters": dict(sorted(_counters.items())),
+        "gauges": dict(sorted(_gauges.items()))
+    }
+
+
+def snapshot() -> Dict:
+    """Point-in-time copy of every metric"""
+    with _lock:
+        return _snapshot()
+
+
+def export_json(path: str = None) -> str:
+    """Metrics snapshot as JSON (also written to `path` if given)"""
+    text = json.dumps(snapshot(), indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+def export_prometheus() -> str:
+    """Metrics in the Prometheus text exposition format"""
+    with _lock:
+        snap = _snapshot()
+        help_texts = dict(_help)
+    lines = []
+    for name, data in snap["histograms"].items():
+        if name in help_texts:
+            lines.append(f"# HELP {name} {help_texts[name]}")
+        lines.append(f"# TYPE {name} histogram")
+        for bound, n in data["buckets"].items():
+            lines.append(f'{name}_bucket{{le="{bound}"}} {n}')
+        lines.append(f"{name}_sum {data['sum']}")
+        lines.append(f"{name}_count {data['count']}")
+    for name, value in snap["counters"].items():
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    for name, value in snap["gauges"].items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# Example usage
+if __name__ == "__main__":
+    import instrumentation  # the module instance the course tools report to
+    from prompt_validator import PromptValidator
+
+    validator = PromptValidator()
+    prompt = "You are a copywriter. Write a 100-word email for busy professionals."
+
+    started = time.perf_counter()
+    for _ in range(20000):
+        validator.score_prompt(prompt)
+    print(f"Disabled: {time.perf_counter() - started:.3f}s")
+
+    instrumentation.enable()
+    started = time.perf_counter()
+    for _ in range(20000):
+        validator.score_prompt(prompt)
+    print(f"Enabled:  {time.perf_counter() - started:.3f}s\n")
+    print(instrumentation.export_prometheus())
@@ -0,0 +1,324 @@
+"""
+Batch Grader for Foundations Lab Notebooks
+Scores the prompts in a directory of student submissions across a process pool
+"""
+
+import ast
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from progress_tracker import ProgressTracker
+
+WEEK = "week1_foundations"
+
+# Notebook variables holding the student's prompts, by exercise
+DEBUGGING_PROMPTS = ("improved_prompt_1", "improved_prompt_2", "improved_prompt_3")
+CLEAR_PARTS = ("context", "length", "examples", "audience", "requirements")
+CLEAR_PROMPT = "final_prompt"  # an f-string combining the CLEAR_PARTS
+PRACTICE_PROMPTS = ("job_application_prompt", "social_media_prompt", "learning_prompt")
+CHALLENGE_PROMPT = "challenge_prompt"
+PROMPT_VARIABLES = DEBUGGING_PROMPTS + (CLEAR_PROMPT,) + PRACTICE_PROMPTS + (CHALLENGE_PROMPT,)
+
+_validator = None
+
+
+def strip_comment_lines(text: str) -> str:
+    """Drop the notebook's '# Write your prompt here' style hint lines"""
+    return "\n".join(line for line in text.splitlines() if not line.lstrip().startswith("#")).strip()
+
+
+def _string_value(node: ast.AST, known: Dict[str, str]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):  # e.g. final_prompt = f"{context}\n{audience}..."
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(str(value.value))
+            elif isinstance(value, ast.FormattedValue) and isinstance(value.value, ast.Name):
+                parts.append(known.get(value.value.id, ""))
+        return "".join(parts)
+    return None
+
+
+def extract_prompts(notebook: Dict) -> Tuple[Dict[str, str], int]:
+    """Prompt texts assigned in a notebook's code cells, and how many cells failed to parse.
+
+    Only top-level string assignments to PROMPT_VARIABLES (and the CLEAR
+    parts final_prompt is built from) count. A later non-empty assignment
+    replaces an earlier one, as it would when the notebook runs top to bottom.
+    """
+    wanted = set(PROMPT_VARIABLES) | set(CLEAR_PARTS)
+    found: Dict[str, str] = {}
+    unparsed = 0
+    for cell in notebook.get("cells", []):
+        if cell.get("cell_type") != "code":
+            continue
+        source = cell.get("source", "")
+        if isinstance(source, list):
+            source = "".join(source)
+        source = "\n".join(line for line in source.splitlines()
+                           if not line.lstrip().startswith(("%", "!")))  # IPython magics
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            unparsed += 1
+            continue
+        for node in tree.body:
+            if not (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name) and node.targets[0].id in wanted):
+                continue
+            text = _string_value(node.value, found)
+            if text is None:
+                continue
+            text = strip_comment_lines(text)
+            if text or node.targets[0].id not in found:
+                found[node.targets[0].id] = text
+    return {name: found[name] for name in PROMPT_VARIABLES if found.get(name)}, unparsed
+
+
+def _mean(values: List[float]) -> float:
+    return round(sum(values) / len(values), 3) if values else 0.0
+
+
+def grade_notebook(path: str) -> Dict:
+    """Grade one notebook (runs in a worker process); errors are returned, not raised"""
+    global _validator
+    started = time.perf_counter()
+    try:
+        if _validator is None:
+            from prompt_validator import PromptValidator
+            _validator = PromptValidator()
+        with open(path, "r", encoding="utf-8") as f:
+            prompts, unparsed = extract_prompts(json.load(f))
+        results = {name: _validator.score_prompt(text) for name, text in prompts.items()}
+
+        def overall(name):
+            return results[name]['overall_score'] if name in results else 0.0
+
+        def breakdown(key):
+            return _mean([r['breakdown'][key] for r in results.values()])
+
+        skills = {
+            "prompt_debugging": _mean([overall(name) for name in DEBUGGING_PROMPTS]),
+            "clear_framework": overall(CLEAR_PROMPT),
+            "context_setting": breakdown("context_score"),
+            "audience_targeting": breakdown("audience_score"),
+            "requirement_specification": breakdown("requirements_score")
+        }
+        assessments = {}
+        if any(name in results for name in PRACTICE_PROMPTS):
+            assessments["practice_scenarios"] = _mean([overall(name) for name in PRACTICE_PROMPTS])
+        if CHALLENGE_PROMPT in results:
+            assessments["challenge_500"] = overall(CHALLENGE_PROMPT)
+
+        graded = {
+            "status": "graded",
+            "prompts": {name: {"score": r['overall_score'], "grade": r['grade']} for name, r in results.items()},
+            "missing": [name for name in PROMPT_VARIABLES if name not in results],
+            "unparsed_cells": unparsed,
+            "skills": skills,
+            "assessments": assessments
+        }
+    except Exception as e:  # one broken submission must not stop the batch
+        graded = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    graded["seconds"] = round(time.perf_counter() - started, 4)
+    return graded
+
+
+def _grade_chunk(paths: List[str]) -> List[Tuple[str, Dict]]:
+    return [(path, grade_notebook(path)) for path in paths]
+
+
+def iter_notebooks(directory: str) -> Iterator[str]:
+    """Yield .ipynb files under a directory, skipping Jupyter checkpoints"""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != ".ipynb_checkpoints")
+        for name in sorted(files):
+            if name.endswith(".ipynb"):
+                yield os.path.join(root, name)
+
+
+def default_student_id(relative_path: str) -> str:
+    """'alice.ipynb' -> 'alice'; 'alice/foundations_lab.ipynb' -> 'alice'"""
+    parts = os.path.splitext(relative_path)[0].split(os.sep)
+    if len(parts) > 1 and parts[-1] == "foundations_lab":
+        parts = parts[:-1]
+    return "/".join(parts)
+
+
+class NotebookGrader:
+    """Grade a directory of foundations_lab submissions into progress trackers.
+
+    Notebooks are graded on a process pool with at most `max_pending_chunks`
+    chunks in flight. Results are recorded through ProgressTracker.update_skill
+    and record_assessment on write-behind trackers, which are saved once per
+    `batch_size` notebooks (in one transaction when `store` is a
+    CohortProgressStore, otherwise to one progress file per student in
+    `progress_dir`). Every notebook then gets a line in the JSONL manifest;
+    a rerun skips notebooks already graded unless the file has changed, so an
+    interrupted run resumes where it stopped. Failed notebooks are recorded
+    and retried on the next run.
+    """
+
+    def __init__(self, manifest_path: str = "grading_manifest.jsonl", store=None,
+                 progress_dir: str = ".", workers: int = None, chunk_size: int = 20,
+                 max_pending_chunks: int = None, batch_size: int = 100,
+                 student_id_for: Callable[[str], str] = default_student_id,
+                 max_failures_kept: int = 100):
+        self.manifest_path = manifest_path
+        self.store = store
+        self.progress_dir = progress_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or self.workers * 2
+        self.batch_size = batch_size
+        self.student_id_for = student_id_for
+        self.max_failures_kept = max_failures_kept
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        """Latest manifest entry per notebook path"""
+        entries = {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from an interrupted run
+                    entries[entry["path"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _tracker(self, student_id: str) -> ProgressTracker:
+        options = {"write_behind": True, "flush_every": 1000, "flush_interval": 3600}
+        if self.store is not None:
+            return self.store.tracker(student_id, **options)
+        filename = f"{student_id.replace('/', '__')}_progress.json"
+        return ProgressTracker(student_id, progress_file=os.path.join(self.progress_dir, filename), **options)
+
+    def _record(self, batch: List[Tuple[str, Dict]], manifest):
+        """Apply a batch of grading results, save progress, then append to the manifest"""
+        trackers = {}
+        for _, entry in batch:
+            if entry["status"] != "graded":
+                continue
+            tracker = trackers.get(entry["student_id"])
+            if tracker is None:
+                tracker = trackers[entry["student_id"]] = self._tracker(entry["student_id"])
+            for skill, score in entry["skills"].items():
+                tracker.update_skill(WEEK, skill, score)
+            for assessment_type, score in entry["assessments"].items():
+                tracker.record_assessment(WEEK, assessment_type, score,
+                                          {"notebook": entry["path"], "prompts": entry["prompts"]})
+        if self.store is not None:
+            self.store.save_trackers(trackers.values())
+        else:
+            for tracker in trackers.values():
+                tracker.flush()
+        for _, entry in batch:
+            manifest.write(json.dumps(entry) + "\n")
+        manifest.flush()
+
+    def grade_directory(self, directory: str) -> Dict:
+        """Grade every new or changed notebook under `directory` and return a summary"""
+        done = {path: entry for path, entry in self.load_manifest().items() if entry["status"] == "graded"}
+        summary = {"notebooks": 0, "graded": 0, "failed": 0, "skipped": 0, "failures": []}
+        started = time.perf_counter()
+        stats = {}
+
+        def todo() -> Iterator[str]:
+            for path in iter_notebooks(directory):
+                summary["notebooks"] += 1
+                relative = os.path.relpath(path, directory)
+                st = os.stat(path)
+                stats[path] = (relative, st.st_size, st.st_mtime_ns)
+                previous = done.get(relative)
+                if previous and (previous["size"], previous["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                    summary["skipped"] += 1
+                    continue
+                yield path
+
+        paths = todo()
+        batch: List[Tuple[str, Dict]] = []
+        with open(self.manifest_path, "a", encoding="utf-8") as manifest, \
+                ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            while True:
+                while len(pending) < self.max_pending_chunks:
+                    chunk = list(islice(paths, self.chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(pool.submit(_grade_chunk, chunk))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for path, result in future.result():
+                        relative, size, mtime_ns = stats.pop(path)
+                        entry = {"path": relative, "student_id": self.student_id_for(relative),
+                                 "size": size, "mtime_ns": mtime_ns, **result}
+                        if result["status"] == "graded":
+                            summary["graded"] += 1
+                        else:
+                            summary["failed"] += 1
+                            if len(summary["failures"]) < self.max_failures_kept:
+                                summary["failures"].append({"path": relative, "error": result["error"]})
+                        batch.append((path, entry))
+                if len(batch) >= self.batch_size:
+                    self._record(batch, manifest)
+                    batch = []
+            if batch:
+                self._record(batch, manifest)
+
+        elapsed = time.perf_counter() - started
+        summary["seconds"] = round(elapsed, 3)
+        processed = summary["graded"] + summary["failed"]
+        summary["notebooks_per_second"] = round(processed / elapsed, 1) if elapsed > 0 else None
+        return summary
+
+
+# Example usage
+if __name__ == "__main__":
+    import copy
+    import random
+    import shutil
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "foundations_lab.ipynb")) as f:
+        template = json.load(f)
+
+    rng = random.Random(5)
+    answers = [
+        "You are a productivity coach. Write a 600-word blog post for remote managers "
+        "who struggle with meetings. Must include 3 tips, for example time-boxing.",
+        "Help me with this Python code",
+        "Act as a senior marketer. Give a 90-day strategy for a 5-person bakery, target audience "
+        "local families, budget $2,000. Format: table."
+    ]
+    shutil.rmtree("demo_submissions", ignore_errors=True)
+    os.makedirs("demo_submissions")
+    for i in range(2000):
+        notebook = copy.deepcopy(template)
+        for cell in notebook["cells"]:
+            source = "".join(cell["source"])
+            for name in PROMPT_VARIABLES:
+                if source.startswith(("# YOUR TURN", "# Write a prompt", "# Your $500")) and f"{name} = " in source:
+                    cell["source"] = f'{name} = """\n{rng.choice(answers)}\n"""\n'
+        with open(f"demo_submissions/student{i:04d}.ipynb", "w") as f:
+            json.dump(notebook, f)
+    with open("demo_submissions/broken.ipynb", "w") as f:
+        f.write("{not json")
+
+    from cohort_store import CohortProgressStore
+    for path in ("demo_grading.jsonl", "demo_cohort.sqlite"):
+        if os.path.exists(path):
+            os.remove(path)
+    grader = NotebookGrader("demo_grading.jsonl", store=CohortProgressStore("demo_cohort.sqlite"))
+    print("First run:", {k: v for k, v in grader.grade_directory("demo_submissions").items() if k != "failures"})
+    print("Resumed:  ", {k: v for k, v in grader.grade_directory("demo_submissions").items() if k != "failures"})
+    print("Week completion:", grader.store.week_completion_rates())
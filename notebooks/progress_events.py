@@ -0,0 +1,200 @@
+"""
+Event-Sourced Progress Log for Prompt Engineering Course
+Every skill update, assessment and project is an event; views are kept incrementally
+"""
+
+import copy
+import datetime
+import json
+from typing import Dict, Iterable
+
+
+class ProgressView:
+    """Materialized progress aggregates, updated in O(1) per event.
+
+    Keeps the same numbers ProgressTracker.get_overall_progress reports
+    (mastered skills per week, assessments, completed projects, next
+    milestone) so dashboard reads never rescan the skills matrix.
+    """
+
+    def __init__(self, skills_matrix: Dict, assessments: Dict = None, projects: Dict = None,
+                 mastery_threshold: float = 0.7, week_threshold: float = 0.8):
+        self.mastery_threshold = mastery_threshold
+        self.week_threshold = week_threshold
+        self.skills_matrix = skills_matrix
+        self.assessments = assessments if assessments is not None else {}
+        self.projects = projects if projects is not None else {}
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every aggregate from the underlying state"""
+        self.weeks = list(self.skills_matrix)
+        self.week_totals = {week: len(skills) for week, skills in self.skills_matrix.items()}
+        self.week_mastered = {
+            week: sum(1 for score in skills.values() if score >= self.mastery_threshold)
+            for week, skills in self.skills_matrix.items()
+        }
+        self.total_skills = sum(self.week_totals.values())
+        self.mastered_skills = sum(self.week_mastered.values())
+        self.completed_projects = {
+            name for name, project in self.projects.items() if project['status'] == 'completed'
+        }
+        self.incomplete_weeks = {i for i, week in enumerate(self.weeks) if not self._week_done(week)}
+
+    def _week_done(self, week: str) -> bool:
+        total = self.week_totals[week]
+        return total > 0 and self.week_mastered[week] / total >= self.week_threshold
+
+    def apply_skill(self, week: str, skill: str, score: float):
+        old = self.skills_matrix[week][skill]
+        new = max(old, score)
+        self.skills_matrix[week][skill] = new
+        delta = (new >= self.mastery_threshold) - (old >= self.mastery_threshold)
+        if delta:
+            self.week_mastered[week] += delta
+            self.mastered_skills += delta
+            position = self.weeks.index(week)
+            if self._week_done(week):
+                self.incomplete_weeks.discard(position)
+            else:
+                self.incomplete_weeks.add(position)
+
+    def apply_assessment(self, week: str, assessment_type: str, score: float,
+                         date: str, details: Dict = None):
+        self.assessments.setdefault(week, {})[assessment_type] = {
+            'score': score,
+            'date': date,
+            'details': details or {}
+        }
+
+    def apply_project(self, project_name: str, description: str, date: str,
+                      github_link: str = None):
+        self.projects[project_name] = {
+            'description': description,
+            'completed_date': date,
+            'github_link': github_link,
+            'status': 'completed'
+        }
+        self.completed_projects.add(project_name)
+
+    def apply(self, event: Dict):
+        """Apply one logged event"""
+        kind = event['type']
+        if kind == 'skill':
+            if event['week'] in self.skills_matrix and event['skill'] in self.skills_matrix[event['week']]:
+                self.apply_skill(event['week'], event['skill'], event['score'])
+        elif kind == 'assessment':
+            self.apply_assessment(event['week'], event['assessment_type'], event['score'],
+                                  event['timestamp'], event.get('details'))
+        elif kind == 'project':
+            self.apply_project(event['project_name'], event['description'],
+                               event['timestamp'], event.get('github_link'))
+
+    def next_milestone(self) -> str:
+        if self.incomplete_weeks:
+            week = self.weeks[min(self.incomplete_weeks)]
+            return f"Focus on {week.replace('_', ' ').title()}"
+        return "Ready for advanced projects!"
+
+    def summary(self) -> Dict:
+        """Same result as ProgressTracker.get_overall_progress"""
+        skill_progress = self.mastered_skills / self.total_skills if self.total_skills > 0 else 0
+        assessment_progress = len(self.assessments) / 4  # 4 weeks
+        project_progress = len(self.completed_projects) / 4  # 4 projects
+        overall = (skill_progress + assessment_progress + project_progress) / 3
+
+        return {
+            'overall_progress': round(overall * 100, 1),
+            'skills_mastered': f"{self.mastered_skills}/{self.total_skills}",
+            'assessments_completed': f"{len(self.assessments)}/4",
+            'projects_completed': f"{len(self.completed_projects)}/4",
+            'next_milestone': self.next_milestone()
+        }
+
+
+class ProgressEventLog:
+    """Append-only JSON-lines log of progress events for one or many students"""
+
+    def __init__(self, path: str = "progress_events.jsonl"):
+        self.path = path
+
+    def append(self, student_id: str, event_type: str, **payload) -> Dict:
+        """Append an event and return it"""
+        event = {
+            'student_id': student_id,
+            'type': event_type,
+            'timestamp': payload.pop('timestamp', None) or datetime.datetime.now().isoformat(),
+            **payload
+        }
+        line = (json.dumps(event, separators=(',', ':')) + "\n").encode()
+        with open(self.path, 'a+b') as f:
+            self._cut_torn_tail(f)
+            f.write(line)
+        return event
+
+    @staticmethod
+    def _cut_torn_tail(f):
+        """Drop a partial last event left by a crashed writer, so the next one starts on its own line"""
+        end = f.seek(0, 2)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end - 1
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        f.truncate(position)
+
+    def read(self, student_id: str = None, until: str = None) -> Iterable[Dict]:
+        """Yield events in log order, optionally for one student and up to a timestamp"""
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written last event
+                event = json.loads(line)
+                if student_id is not None and event['student_id'] != student_id:
+                    continue
+                if until is not None and event['timestamp'] > until:
+                    continue
+                yield event
+
+    def replay(self, skills_matrix_template: Dict, student_id: str,
+               until: str = None, mastery_threshold: float = 0.7) -> ProgressView:
+        """Rebuild a student's progress view from the log (as of `until`, if given)"""
+        if student_id is None:
+            raise ValueError("replay needs a student_id; events of different students cannot share one view")
+        view = ProgressView(copy.deepcopy(skills_matrix_template), mastery_threshold=mastery_threshold)
+        for event in self.read(student_id, until):
+            view.apply(event)
+        return view
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    from progress_tracker import SKILLS_MATRIX_TEMPLATE, ProgressTracker
+
+    for path in ("demo_progress.json", "demo_events.jsonl"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    log = ProgressEventLog("demo_events.jsonl")
+    tracker = ProgressTracker("Elena", progress_file="demo_progress.json", event_log=log)
+    tracker.update_skill("week1_foundations", "prompt_debugging", 0.8)
+    checkpoint = datetime.datetime.now().isoformat()
+    tracker.update_skill("week1_foundations", "clear_framework", 0.9)
+    tracker.record_assessment("week1_foundations", "broken_prompts_challenge", 0.85)
+
+    print("Now:", tracker.get_overall_progress())
+    print("As of checkpoint:", log.replay(SKILLS_MATRIX_TEMPLATE, "Elena", until=checkpoint).summary())
@@ -3,184 +3,278 @@ Progress Tracking System for Prompt Engineering Course
 Tracks skills, assessments, and portfolio completion
 """
 
-import json
+import atexit
+import copy
 import datetime
+import threading
+import weakref
+from functools import lru_cache
 from typing import Dict, List
 from pathlib import Path
 
+import codec
+import instrumentation
+from progress_events import ProgressEventLog, ProgressView
+
+MASTERY_THRESHOLD = 0.7  # a skill counts as mastered at this score
+
+SKILLS_MATRIX_TEMPLATE = {
+    "week1_foundations": {
+        "prompt_debugging": 0,
+        "clear_framework": 0,
+        "context_setting": 0,
+        "audience_targeting": 0,
+        "requirement_specification": 0
+    },
+    "week2_context": {
+        "domain_knowledge": 0,
+        "data_integration": 0,
+        "business_context": 0,
+        "industry_specificity": 0
+    },
+    "week3_agents": {
+        "tool_integration": 0,
+        "decision_making": 0,
+        "workflow_design": 0,
+        "error_handling": 0
+    },
+    "week4_production": {
+        "version_control": 0,
+        "ab_testing": 0,
+        "performance_monitoring": 0,
+        "deployment": 0
+    }
+}
+
+_write_behind_trackers = weakref.WeakSet()
+
+@atexit.register
+def _flush_all_trackers():
+    """Flush write-behind trackers still holding unsaved changes at interpreter exit"""
+    for tracker in list(_write_behind_trackers):
+        tracker.flush()
+
+@lru_cache(maxsize=None)
+def _display_name(key: str) -> str:
+    """'week1_foundations' -> 'Week1 Foundations' (cached, keys repeat for every student)"""
+    return key.replace('_', ' ').title()
+
+def create_progress_bar(score: float, length: int = 10) -> str:
+    """Create a visual progress bar"""
+    filled = int(score * length)
+    bar = "█" * filled + "░" * (length - filled)
+    return f"[{bar}]"
+
+def render_skill_report(student_name: str, skills_matrix: Dict) -> str:
+    """Render the skill progress report for one student's skills matrix"""
+    parts = [f"\n📊 SKILL PROGRESS REPORT - {student_name}\n", "=" * 50 + "\n\n"]
+    
+    for week, skills in skills_matrix.items():
+        parts.append(f"🗓️  {_display_name(week)}:\n")
+        
+        for skill, score in skills.items():
+            status = "✅ Mastered" if score >= MASTERY_THRESHOLD else "🔄 In Progress" if score > 0 else "⏳ Not Started"
+            parts.append(f"   {_display_name(skill)}: {create_progress_bar(score)} {score:.1%} {status}\n")
+        
+        parts.append("\n")
+    
+    return "".join(parts)
+
+CERTIFICATE_TEMPLATE = """
+🏆 CERTIFICATE OF COMPLETION 🏆
+
+This certifies that {student_name} has successfully completed
+{week_name} of the Prompt Engineering Mastery Course
+
+Skills Mastered: {mastery_rate:.1%}
+Date: {date}
+
+Verified competencies:
+"""
+
+def week_mastery_rate(skills_matrix: Dict, week: str) -> float:
+    week_skills = skills_matrix.get(week, {})
+    return sum(1 for score in week_skills.values() if score >= MASTERY_THRESHOLD) / len(week_skills)
+
+def render_certificate(student_name: str, week: str, skills_matrix: Dict, date: str = None) -> str:
+    """Render a week's completion certificate (or the not-yet-earned message)"""
+    mastery_rate = week_mastery_rate(skills_matrix, week)
+    
+    if mastery_rate >= 0.8:
+        parts = [CERTIFICATE_TEMPLATE.format(
+            student_name=student_name,
+            week_name=_display_name(week),
+            mastery_rate=mastery_rate,
+            date=date or datetime.datetime.now().strftime('%B %d, %Y')
+        )]
+        for skill, score in skills_matrix[week].items():
+            if score >= MASTERY_THRESHOLD:
+                parts.append(f"✓ {_display_name(skill)}\n")
+        
+        return "".join(parts)
+    else:
+        return f"Complete {week} with 80% skill mastery to earn certificate. Current: {mastery_rate:.1%}"
+
 class ProgressTracker:
-    def __init__(self, student_name: str = "Student"):
+    def __init__(self, student_name: str = "Student", write_behind: bool = False,
+                 flush_interval: float = 5.0, flush_every: int = 100,
+                 progress_file: str = "progress.json", store=None, student_id: str = None,
+                 event_log: ProgressEventLog = None, storage_format: str = "json"):
+        """With write_behind=True, updates only mark the tracker dirty; progress is
+        saved after `flush_every` updates, `flush_interval` seconds, an explicit
+        flush(), leaving a `with` block, or interpreter shutdown.
+        
+        Pass a cohort_store.CohortProgressStore as `store` to keep many students
+        in one database instead of one progress file per directory, and an
+        `event_log` to also append every update as an event that can be replayed."""
         self.student_name = student_name
-        self.progress_file = Path("progress.json")
-        self.skills_matrix = {
-            "week1_foundations": {
-                "prompt_debugging": 0,
-                "clear_framework": 0,
-                "context_setting": 0,
-                "audience_targeting": 0,
-                "requirement_specification": 0
-            },
-            "week2_context": {
-                "domain_knowledge": 0,
-                "data_integration": 0,
-                "business_context": 0,
-                "industry_specificity": 0
-            },
-            "week3_agents": {
-                "tool_integration": 0,
-                "decision_making": 0,
-                "workflow_design": 0,
-                "error_handling": 0
-            },
-            "week4_production": {
-                "version_control": 0,
-                "ab_testing": 0,
-                "performance_monitoring": 0,
-                "deployment": 0
-            }
-        }
+        self.progress_file = Path(progress_file)
+        self.store = store
+        self.student_id = student_id or student_name
+        self.event_log = event_log
+        self.storage_format = storage_format  # 'json', 'compact' or 'binary' (see codec.py)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self._pending_updates = 0
+        self._flush_timer = None
+        self._lock = threading.RLock()
+        if write_behind:
+            _write_behind_trackers.add(self)
+        self.skills_matrix = copy.deepcopy(SKILLS_MATRIX_TEMPLATE)
         self.load_progress()
+        self.rebuild_view()
+    
+    def rebuild_view(self):
+        """Recompute the progress aggregates (needed only after editing skills_matrix directly)"""
+        self._view = ProgressView(self.skills_matrix, self.assessments, self.projects,
+                                  mastery_threshold=MASTERY_THRESHOLD)
     
     def load_progress(self):
         """Load existing progress or create new file"""
-        if self.progress_file.exists():
-            with open(self.progress_file, 'r') as f:
-                data = json.load(f)
-                self.skills_matrix = data.get('skills_matrix', self.skills_matrix)
-                self.assessments = data.get('assessments', {})
-                self.projects = data.get('projects', {})
+        data = None
+        if self.store is not None:
+            data = self.store.load(self.student_id)
+        elif self.progress_file.exists():
+            data = codec.load(self.progress_file)
+        
+        if data is not None:
+            self.skills_matrix = data.get('skills_matrix', self.skills_matrix)
+            self.assessments = data.get('assessments', {})
+            self.projects = data.get('projects', {})
         else:
             self.assessments = {}
             self.projects = {}
     
+    @instrumentation.timed("progress_tracker_save_progress")
     def save_progress(self):
-        """Save current progress to file"""
-        data = {
+        """Save current progress to file (atomically, via a temp file and rename)"""
+        with self._lock:
+            data = self.progress_data()
+            if self.store is not None:
+                self.store.save(self.student_id, data)
+            else:
+                instrumentation.record_write("progress_tracker", codec.dump(data, self.progress_file, self.storage_format))
+            self.mark_saved()
+    
+    def progress_data(self) -> Dict:
+        """Current progress in the layout of the progress file"""
+        return {
             'student_name': self.student_name,
             'last_updated': datetime.datetime.now().isoformat(),
             'skills_matrix': self.skills_matrix,
             'assessments': self.assessments,
             'projects': self.projects
         }
-        with open(self.progress_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    
+    def mark_saved(self):
+        """Clear pending write-behind changes after progress_data() was persisted"""
+        with self._lock:
+            self._pending_updates = 0
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+    
+    def _changed(self):
+        """Persist a change now, or mark the tracker dirty in write-behind mode"""
+        if not self.write_behind:
+            self.save_progress()
+            return
+        with self._lock:
+            self._pending_updates += 1
+            if self._pending_updates >= self.flush_every:
+                self.save_progress()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    @property
+    def dirty(self) -> bool:
+        return self._pending_updates > 0
+    
+    def flush(self):
+        """Write pending write-behind changes to disk"""
+        with self._lock:
+            if self._pending_updates:
+                self.save_progress()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.flush()
     
     def update_skill(self, week: str, skill: str, score: float):
         """Update a specific skill score (0-1)"""
         if week in self.skills_matrix and skill in self.skills_matrix[week]:
-            self.skills_matrix[week][skill] = max(self.skills_matrix[week][skill], score)
-            self.save_progress()
+            with self._lock:
+                self._view.apply_skill(week, skill, score)
+                if self.event_log is not None:
+                    self.event_log.append(self.student_id, 'skill', week=week, skill=skill, score=score)
+                self._changed()
             return True
         return False
     
     def record_assessment(self, week: str, assessment_type: str, score: float, details: Dict = None):
         """Record assessment results"""
-        if week not in self.assessments:
-            self.assessments[week] = {}
-        
-        self.assessments[week][assessment_type] = {
-            'score': score,
-            'date': datetime.datetime.now().isoformat(),
-            'details': details or {}
-        }
-        self.save_progress()
+        with self._lock:
+            date = datetime.datetime.now().isoformat()
+            self._view.apply_assessment(week, assessment_type, score, date, details)
+            if self.event_log is not None:
+                self.event_log.append(self.student_id, 'assessment', timestamp=date, week=week,
+                                      assessment_type=assessment_type, score=score, details=details or {})
+            self._changed()
     
     def complete_project(self, project_name: str, description: str, github_link: str = None):
         """Mark a project as completed"""
-        self.projects[project_name] = {
-            'description': description,
-            'completed_date': datetime.datetime.now().isoformat(),
-            'github_link': github_link,
-            'status': 'completed'
-        }
-        self.save_progress()
+        with self._lock:
+            date = datetime.datetime.now().isoformat()
+            self._view.apply_project(project_name, description, date, github_link)
+            if self.event_log is not None:
+                self.event_log.append(self.student_id, 'project', timestamp=date, project_name=project_name,
+                                      description=description, github_link=github_link)
+            self._changed()
     
     def get_overall_progress(self) -> Dict:
-        """Calculate overall progress statistics"""
-        total_skills = sum(len(week_skills) for week_skills in self.skills_matrix.values())
-        completed_skills = sum(
-            sum(1 for score in week_skills.values() if score >= 0.7)
-            for week_skills in self.skills_matrix.values()
-        )
-        
-        skill_progress = completed_skills / total_skills if total_skills > 0 else 0
-        
-        assessment_progress = len(self.assessments) / 4  # 4 weeks
-        project_progress = len([p for p in self.projects.values() if p['status'] == 'completed']) / 4  # 4 projects
-        
-        overall = (skill_progress + assessment_progress + project_progress) / 3
-        
-        return {
-            'overall_progress': round(overall * 100, 1),
-            'skills_mastered': f"{completed_skills}/{total_skills}",
-            'assessments_completed': f"{len(self.assessments)}/4",
-            'projects_completed': f"{len([p for p in self.projects.values() if p['status'] == 'completed'])}/4",
-            'next_milestone': self._get_next_milestone()
-        }
+        """Calculate overall progress statistics (O(1), from the maintained progress view)"""
+        return self._view.summary()
     
     def _get_next_milestone(self) -> str:
         """Determine what the student should focus on next"""
-        week_progress = {}
-        for week, skills in self.skills_matrix.items():
-            mastered = sum(1 for score in skills.values() if score >= 0.7)
-            total = len(skills)
-            week_progress[week] = mastered / total
-        
-        for week, progress in week_progress.items():
-            if progress < 0.8:  # Less than 80% mastered
-                return f"Focus on {week.replace('_', ' ').title()}"
-        
-        return "Ready for advanced projects!"
+        return self._view.next_milestone()
     
     def generate_skill_report(self) -> str:
         """Generate a detailed skill progress report"""
-        report = f"\n📊 SKILL PROGRESS REPORT - {self.student_name}\n"
-        report += "=" * 50 + "\n\n"
-        
-        for week, skills in self.skills_matrix.items():
-            week_name = week.replace('_', ' ').title()
-            report += f"🗓️  {week_name}:\n"
-            
-            for skill, score in skills.items():
-                skill_name = skill.replace('_', ' ').title()
-                progress_bar = self._create_progress_bar(score)
-                status = "✅ Mastered" if score >= 0.7 else "🔄 In Progress" if score > 0 else "⏳ Not Started"
-                report += f"   {skill_name}: {progress_bar} {score:.1%} {status}\n"
-            
-            report += "\n"
-        
-        return report
+        return render_skill_report(self.student_name, self.skills_matrix)
     
     def _create_progress_bar(self, score: float, length: int = 10) -> str:
         """Create a visual progress bar"""
-        filled = int(score * length)
-        bar = "█" * filled + "░" * (length - filled)
-        return f"[{bar}]"
+        return create_progress_bar(score, length)
     
     def generate_certificate(self, week: str) -> str:
         """Generate a completion certificate for a week"""
-        week_skills = self.skills_matrix.get(week, {})
-        mastery_rate = sum(1 for score in week_skills.values() if score >= 0.7) / len(week_skills)
-        
-        if mastery_rate >= 0.8:
-            certificate = f"""
-🏆 CERTIFICATE OF COMPLETION 🏆
-
-This certifies that {self.student_name} has successfully completed
-{week.replace('_', ' ').title()} of the Prompt Engineering Mastery Course
-
-Skills Mastered: {mastery_rate:.1%}
-Date: {datetime.datetime.now().strftime('%B %d, %Y')}
-
-Verified competencies:
-"""
-            for skill, score in week_skills.items():
-                if score >= 0.7:
-                    certificate += f"✓ {skill.replace('_', ' ').title()}\n"
-            
-            return certificate
-        else:
-            return f"Complete {week} with 80% skill mastery to earn certificate. Current: {mastery_rate:.1%}"
+        return render_certificate(self.student_name, week, self.skills_matrix)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""
+Prompt Serving Cache
+Read-optimized handle for fetching live prompts on a request path
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import codec
+from prompt_version_control import project_filename
+
+
+class PromptServingHandle:
+    """Keeps branch heads and their prompt texts in memory.
+
+    Each lookup compares the project file's (inode, mtime, size) with the
+    last load; PromptVersionControl saves by atomic rename, so any write by
+    another process changes the inode. Only then is the file re-read, and
+    only heads that moved get their text replaced (a version's text never
+    changes, so unchanged heads are kept). `check_interval` limits how often
+    the file is stat'ed, for the hottest paths.
+    """
+
+    def __init__(self, project_name: str, check_interval: float = 0.0):
+        self.project_name = project_name
+        self.path = project_filename(project_name)
+        self.check_interval = check_interval
+        self.heads: Dict[str, Optional[str]] = {}  # branch -> version_id
+        self.texts: Dict[str, str] = {}  # version_id -> prompt text
+        self.current_version: Optional[str] = None
+        self.reloads = 0
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def refresh(self) -> bool:
+        """Reload if the project file changed; returns True if anything was reloaded"""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return False
+
+        with self._lock:
+            if signature == self._signature:
+                return False  # another thread already reloaded
+            data = codec.load(self.path) if signature is not None else {}
+            versions = data.get("versions", {})
+            heads = dict(data.get("branches", {}))
+            current = data.get("current_version")
+            self._signature = signature
+            # Any save changes the file; only moved heads need new texts
+            if heads == self.heads and current == self.current_version:
+                return False
+
+            texts = {}
+            for version_id in set(heads.values()) | {current}:
+                if version_id is None or version_id not in versions:
+                    continue
+                texts[version_id] = self.texts.get(version_id) or versions[version_id]["prompt_text"]
+
+            self.texts = texts
+            self.heads = heads
+            self.current_version = current
+            self.reloads += 1
+            return True
+
+    def _maybe_refresh(self):
+        if self.check_interval:
+            now = time.monotonic()
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+        self.refresh()
+
+    def get_current_prompt(self, branch: str = None) -> Optional[str]:
+        """Prompt text at a branch head (or the project's current version if no branch)"""
+        self._maybe_refresh()
+        version_id = self.current_version if branch is None else self.heads.get(branch)
+        return self.texts.get(version_id) if version_id else None
+
+    def get_head(self, branch: str = "main") -> Optional[str]:
+        """Version id at a branch head"""
+        self._maybe_refresh()
+        return self.heads.get(branch)
+
+
+# Example usage
+if __name__ == "__main__":
+    from prompt_version_control import PromptVersionControl
+
+    vc = PromptVersionControl("Serving Demo")
+    vc.create_version("You are a support agent. Answer in 3 sentences.", "Initial", "Elena")
+    handle = PromptServingHandle("Serving Demo")
+    print("Live prompt:", handle.get_current_prompt("main"))
+
+    runs = 100000
+    started = time.perf_counter()
+    for _ in range(runs):
+        handle.get_current_prompt("main")
+    print(f"Lookup: {(time.perf_counter() - started) / runs * 1e6:.2f} µs (stat every call)")
+
+    writer = PromptVersionControl("Serving Demo")  # e.g. another process
+    writer.create_version("You are a senior support agent. Answer in 2 sentences.", "Tighter", "Elena")
+    print("After external write:", handle.get_current_prompt("main"), f"(reloads: {handle.reloads})")
@@ -6,6 +6,8 @@ Provides immediate feedback on prompt quality
 import re
 from typing import Dict, List, Tuple
 
+import instrumentation
+
 class PromptValidator:
     def __init__(self):
         self.clear_framework = {
@@ -16,6 +18,7 @@ class PromptValidator:
             'requirements': ['must include', 'requirements', 'should contain', 'needs to']
         }
     
+    @instrumentation.timed("prompt_validator_score_prompt")
     def score_prompt(self, prompt: str) -> Dict:
         """Score a prompt based on CLEAR framework and best practices"""
         prompt_lower = prompt.lower()
@@ -3,11 +3,14 @@ Version Control System for Prompts
 Track changes, rollbacks, and performance across prompt versions
 """
 
-import json
 import hashlib
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+import codec
+import instrumentation
 
 @dataclass
 class PromptVersion:
@@ -20,13 +23,24 @@ class PromptVersion:
     performance_metrics: Optional[Dict] = None
     tags: Optional[List[str]] = None
 
+_version_codec = codec.codec_for(PromptVersion)
+
+def project_filename(project_name: str) -> str:
+    """File that stores a project's versions"""
+    return f"{project_name.lower().replace(' ', '_')}_versions.json"
+
 class PromptVersionControl:
-    def __init__(self, project_name: str):
+    def __init__(self, project_name: str, storage_format: str = "json", scorer=None):
+        """Pass a version_scoring.VersionScorer as `scorer` to score every new
+        version with PromptValidator in the background."""
         self.project_name = project_name
+        self.storage_format = storage_format  # 'json', 'compact' or 'binary' (see codec.py)
         self.versions: Dict[str, PromptVersion] = {}
         self.current_version: Optional[str] = None
         self.branches: Dict[str, str] = {"main": None}  # branch_name -> latest_version_id
         self.current_branch = "main"
+        self.scorer = scorer
+        self._lock = threading.RLock()  # the scorer updates metrics from its own threads
         self.load_project()
     
     def create_version(self, prompt_text: str, description: str, author: str, 
@@ -47,10 +61,13 @@ class PromptVersionControl:
             tags=tags or []
         )
         
-        self.versions[version_id] = version
-        self.current_version = version_id
-        self.branches[self.current_branch] = version_id
-        self.save_project()
+        with self._lock:
+            self.versions[version_id] = version
+            self.current_version = version_id
+            self.branches[self.current_branch] = version_id
+            self.save_project()
+        if self.scorer is not None:
+            self.scorer.submit(self, version_id, prompt_text)
         
         return version_id
     
@@ -110,10 +127,11 @@ class PromptVersionControl:
     def update_performance_metrics(self, version_id: str, metrics: Dict) -> bool:
         """Update performance metrics for a version"""
         if version_id in self.versions:
-            if self.versions[version_id].performance_metrics is None:
-                self.versions[version_id].performance_metrics = {}
-            self.versions[version_id].performance_metrics.update(metrics)
-            self.save_project()
+            with self._lock:
+                if self.versions[version_id].performance_metrics is None:
+                    self.versions[version_id].performance_metrics = {}
+                self.versions[version_id].performance_metrics.update(metrics)
+                self.save_project()
             return True
         return False
     
@@ -130,7 +148,8 @@ class PromptVersionControl:
                 "tags": version.tags or [],
                 "performance": {
                     "avg_score": metrics.get("avg_score", "N/A"),
-                    "usage_count": metrics.get("usage_count", 0)
+                    "usage_count": metrics.get("usage_count", 0),
+                    "validator_score": metrics.get("validator_score", "N/A")
                 },
                 "is_current": version.version_id == self.current_version
             })
@@ -174,18 +193,22 @@ class PromptVersionControl:
         }
     
     def find_best_performing_version(self) -> Optional[str]:
-        """Find the version with the best performance metrics"""
-        best_version = None
-        best_score = -1
-        
-        for version_id, version in self.versions.items():
-            if version.performance_metrics and "avg_score" in version.performance_metrics:
-                score = version.performance_metrics["avg_score"]
-                if score > best_score:
-                    best_score = score
-                    best_version = version_id
-        
-        return best_version
+        """Find the version with the best performance metrics
+        (ranked by validator score while no version has production metrics)"""
+        for metric in ("avg_score", "validator_score"):
+            best_version = None
+            best_score = -1
+            
+            for version_id, version in self.versions.items():
+                if version.performance_metrics and metric in version.performance_metrics:
+                    score = version.performance_metrics[metric]
+                    if score > best_score:
+                        best_score = score
+                        best_version = version_id
+            
+            if best_version is not None:
+                return best_version
+        return None
     
     def generate_changelog(self) -> str:
         """Generate a changelog for the project"""
@@ -210,30 +233,31 @@ class PromptVersionControl:
         
         return changelog
     
+    @instrumentation.timed("version_control_save_project")
     def save_project(self):
         """Save project data to file"""
-        data = {
-            "project_name": self.project_name,
-            "versions": {vid: asdict(version) for vid, version in self.versions.items()},
-            "current_version": self.current_version,
-            "branches": self.branches,
-            "current_branch": self.current_branch
-        }
-        
-        filename = f"{self.project_name.lower().replace(' ', '_')}_versions.json"
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
+        with self._lock:
+            data = {
+                "project_name": self.project_name,
+                "versions": {vid: _version_codec.encode(version) for vid, version in self.versions.items()},
+                "current_version": self.current_version,
+                "branches": self.branches,
+                "current_branch": self.current_branch
+            }
+            
+            filename = project_filename(self.project_name)
+            instrumentation.record_write("version_control", codec.dump(data, filename, self.storage_format))
     
+    @instrumentation.timed("version_control_load_project")
     def load_project(self):
         """Load project data from file"""
-        filename = f"{self.project_name.lower().replace(' ', '_')}_versions.json"
+        filename = project_filename(self.project_name)
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
+            data = codec.load(filename)
             
             # Load versions
             for vid, version_data in data.get("versions", {}).items():
-                self.versions[vid] = PromptVersion(**version_data)
+                self.versions[vid] = _version_codec.decode(version_data)
             
             self.current_version = data.get("current_version")
             self.branches = data.get("branches", {"main": None})
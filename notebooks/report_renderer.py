@@ -0,0 +1,130 @@
+"""
+Batch Report and Certificate Renderer
+Renders skill reports and certificates for a whole cohort across a process pool
+"""
+
+import datetime
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import quote
+
+from progress_tracker import render_certificate, render_skill_report, week_mastery_rate
+
+
+def student_dir_name(student_id: str) -> str:
+    """Folder name for a student's files: the id percent-encoded (e.g. 'a/b' -> 'a%2Fb').
+
+    The encoding is one-to-one, so distinct ids never share a folder.
+    """
+    name = quote(str(student_id), safe=" -_.@+,=")
+    if name in ("", ".", ".."):
+        raise ValueError(f"Student id {student_id!r} cannot be used as a folder name")
+    return name
+
+
+def _render_chunk(chunk: List[Tuple[str, Dict]], date: str) -> List[Tuple[str, Dict[str, str]]]:
+    """Render every file for a chunk of students (runs in a worker process)"""
+    rendered = []
+    for student_id, data in chunk:
+        name = data.get('student_name', student_id)
+        skills_matrix = data['skills_matrix']
+        files = {"skill_report.txt": render_skill_report(name, skills_matrix)}
+        for week, skills in skills_matrix.items():
+            if skills and week_mastery_rate(skills_matrix, week) >= 0.8:
+                files[f"certificate_{week}.txt"] = render_certificate(name, week, skills_matrix, date)
+        rendered.append((student_id, files))
+    return rendered
+
+
+def render_cohort(records: Iterable[Tuple[str, Dict]], output_dir: str = None,
+                  archive_path: str = None, workers: int = None,
+                  chunk_size: int = 200, max_pending_chunks: int = None) -> Dict:
+    """Render reports and earned certificates for many students.
+
+    `records` yields (student_id, progress data) pairs, e.g. from
+    CohortProgressStore.iter_students(). Output goes to `output_dir/<student_id>/`
+    or into a single zip at `archive_path` (ids are escaped with student_dir_name;
+    ids that cannot be, or that differ from an earlier id only in case, are
+    skipped and listed in `rejected_ids`). At most
+    `max_pending_chunks` chunks are in flight, so memory stays bounded however
+    large the cohort.
+    Text is identical to ProgressTracker.generate_skill_report/generate_certificate.
+    """
+    if (output_dir is None) == (archive_path is None):
+        raise ValueError("Give exactly one of output_dir or archive_path")
+
+    workers = workers or os.cpu_count() or 1
+    max_pending_chunks = max_pending_chunks or workers * 2
+    date = datetime.datetime.now().strftime('%B %d, %Y')  # one date for the whole batch
+    archive = zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) if archive_path else None
+    stats = {"students": 0, "files": 0, "bytes": 0, "rejected_ids": []}
+    used_folders = set()  # casefolded, for case-insensitive file systems
+    started = time.perf_counter()
+
+    def write(rendered):
+        for student_id, files in rendered:
+            try:
+                folder = student_dir_name(student_id)
+            except ValueError:
+                folder = None
+            if folder is None or folder.casefold() in used_folders:
+                stats["rejected_ids"].append(student_id)
+                continue
+            used_folders.add(folder.casefold())
+            for filename, text in files.items():
+                data = text.encode()
+                if archive is not None:
+                    archive.writestr(f"{folder}/{filename}", data)
+                else:
+                    student_dir = os.path.join(output_dir, folder)
+                    os.makedirs(student_dir, exist_ok=True)
+                    with open(os.path.join(student_dir, filename), "wb") as f:
+                        f.write(data)
+                stats["files"] += 1
+                stats["bytes"] += len(data)
+            stats["students"] += 1
+
+    records = iter(records)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            while True:
+                while len(pending) < max_pending_chunks:
+                    chunk = list(islice(records, chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(pool.submit(_render_chunk, chunk, date))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+    finally:
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["students_per_second"] = round(stats["students"] / elapsed, 1) if elapsed > 0 else None
+    return stats
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    from progress_tracker import SKILLS_MATRIX_TEMPLATE
+
+    rng = random.Random(3)
+    cohort = (
+        (f"s{i:05d}", {
+            'student_name': f"Student {i}",
+            'skills_matrix': {week: {skill: rng.choice([0, 0.5, 0.8, 1.0]) for skill in skills}
+                              for week, skills in SKILLS_MATRIX_TEMPLATE.items()}
+        })
+        for i in range(20000)
+    )
+    print("Rendered:", render_cohort(cohort, archive_path="demo_reports.zip"))
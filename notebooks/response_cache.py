@@ -0,0 +1,169 @@
+"""
+Persistent Response Cache for Prompt Experiments
+Avoid paying twice for the same (prompt, input, model parameters) call
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+def cache_key(prompt: str, input_text: str, params: Dict = None) -> str:
+    """Stable hash of everything that determines a model response"""
+    payload = json.dumps([prompt, input_text, params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """On-disk LRU cache of model responses backed by SQLite.
+
+    SQLite's WAL mode lets many processes read while one writes. When the
+    stored responses exceed `max_bytes`, the least recently used are evicted.
+    """
+
+    TOUCH_BATCH = 256  # access-time updates are written in batches
+
+    def __init__(self, path: str = "response_cache.sqlite", max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO meta VALUES ('total_bytes', 0);
+        """)
+        self._conn.commit()
+
+    def get(self, prompt: str, input_text: str, params: Dict = None) -> Optional[str]:
+        """Return the cached response, or None on a miss"""
+        key = cache_key(prompt, input_text, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._flush_touches()
+            return row[0]
+
+    def put(self, prompt: str, input_text: str, response: str, params: Dict = None):
+        """Store a response and evict old entries if the cache is over budget"""
+        key = cache_key(prompt, input_text, params)
+        size = len(response.encode())
+        with self._lock, self._conn:
+            # Take the write lock first so the size read below can't be stale
+            # when another process stores the same key at the same time
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._flush_touches(commit=False)
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time())
+            )
+            self._conn.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'total_bytes'",
+                (size - (old[0] if old else 0),)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes"""
+        total = self._total_bytes()
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.execute(
+                    "UPDATE meta SET value = value - ? WHERE name = 'total_bytes'", (size,)
+                )
+                total -= size
+                self.evictions += 1
+
+    def _flush_touches(self, commit: bool = True):
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE responses SET last_access = ? WHERE key = ?",
+            [(ts, key) for key, ts in self._touched.items()]
+        )
+        self._touched.clear()
+        if commit:
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """Hit-rate and size statistics for this cache"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            total_bytes = self._total_bytes()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock, self._conn:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("UPDATE meta SET value = 0 WHERE name = 'total_bytes'")
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    with ResponseCache("demo_response_cache.sqlite", max_bytes=10_000) as cache:
+        cache.clear()
+        params = {"model": "gpt-4o-mini", "temperature": 0}
+        print("First lookup:", cache.get("Summarize", "Ticket 1", params))
+        cache.put("Summarize", "Ticket 1", "Login fails after password reset.", params)
+        print("Second lookup:", cache.get("Summarize", "Ticket 1", params))
+
+        for i in range(200):
+            cache.put("Summarize", f"Ticket {i}", "x" * 100, params)
+        print("Stats:", cache.get_stats())
@@ -0,0 +1,303 @@
+"""
+Multi-Process Result Ingestion for Prompt A/B Tests
+Workers submit results through a queue to one batching writer process
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import MISSING, fields
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import fcntl  # POSIX advisory locks; without them appends are not serialized
+except ImportError:
+    fcntl = None
+
+from ab_testing_framework import TestResult
+from blob_store import BlobStore
+
+RESULT_FIELDS = [f.name for f in fields(TestResult)]
+_RECORD_DEFAULTS = {f.name: None if f.default is MISSING else f.default for f in fields(TestResult)}
+STOP = None  # sentinel that tells the writer to finish
+
+
+def encode_record(record: Dict) -> bytes:
+    """One JSON line for a result dict (raises TypeError/ValueError if it is not JSON)"""
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+class ResultLog:
+    """Append-only JSON-lines file of TestResult records.
+
+    Each batch is appended with a single write under an exclusive lock, and
+    readers stop at the last complete line, so a snapshot is always a
+    consistent prefix of the log. A line torn by a killed writer is cut off
+    before the next append.
+    """
+
+    def __init__(self, path: str = "ab_test_results.jsonl"):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None  # open while locked() is held
+
+    @contextmanager
+    def locked(self):
+        """Open the log for appending and hold its lock (repairs a torn tail).
+
+        Reentrant: writes made while the lock is held reuse the same handle.
+        """
+        with self._thread_lock:
+            if self._fd is not None:
+                yield self._fd
+                return
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._cut_torn_tail(fd)
+                self._fd = fd
+                yield fd
+            finally:
+                self._fd = None
+                os.close(fd)  # also releases the lock
+
+    @staticmethod
+    def _cut_torn_tail(fd: int):
+        """Truncate the file back to its last newline (nobody else is writing)"""
+        end = os.fstat(fd).st_size
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            os.lseek(fd, start, os.SEEK_SET)
+            chunk = os.read(fd, position - start)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            os.ftruncate(fd, position)
+
+    def append(self, records: List[Dict], fsync: bool = False) -> int:
+        """Append result dicts and return the number of bytes written"""
+        return self.write(b"".join(encode_record(r) for r in records), fsync)
+
+    def write(self, payload: bytes, fsync: bool = False) -> int:
+        """Append already encoded lines (see encode_record)"""
+        if not payload:
+            return 0
+        with self.locked() as fd:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+        return len(payload)
+
+    def snapshot(self, test_id: str = None) -> List[TestResult]:
+        """Read every complete, valid record (optionally only one test's)"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        data = data[:data.rfind(b"\n") + 1]  # drop a batch still being written
+        results = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+                if test_id is None or record["test_id"] == test_id:
+                    results.append(TestResult(**record))
+            except (ValueError, TypeError, KeyError):
+                continue  # a damaged line; skip it rather than lose the whole log
+        return results
+
+
+def _writer_loop(result_queue, log_path: str, batch_size: int, flush_interval: float,
+                 blob_path: Optional[str], fsync: bool, stats):
+    """Body of the writer process: drain the queue and append in batches.
+
+    Records that cannot be stored are rejected one by one. If writing fails
+    altogether the error is recorded and the queue is still drained (so
+    workers never block on a full queue) until STOP.
+    """
+    log = ResultLog(log_path)
+    blob_store = BlobStore(blob_path) if blob_path else None
+    buffer: List[Dict] = []
+    last_flush = time.monotonic()
+    written = rejected = 0
+    failed = False
+
+    def flush():
+        nonlocal last_flush, written, rejected
+        lines = []
+        for record in buffer:
+            try:
+                if blob_store is not None and record.get("response_text") is not None:
+                    record["response_ref"] = blob_store.put(record["response_text"])
+                    record["response_text"] = None
+                lines.append(encode_record(record))
+            except (TypeError, ValueError, AttributeError) as e:
+                rejected += 1
+                stats["rejected"] = rejected
+                stats["last_error"] = f"{type(e).__name__}: {e}"
+        if blob_store is not None:
+            blob_store.flush()
+        log.write(b"".join(lines), fsync=fsync)
+        written += len(lines)
+        stats["written"] = written
+        buffer.clear()
+        last_flush = time.monotonic()
+
+    while True:
+        try:
+            batch = result_queue.get(timeout=flush_interval)
+        except queue.Empty:
+            batch = []
+        if batch is STOP:
+            break
+        if failed:
+            stats["lost"] += len(batch)
+            continue
+        buffer.extend(batch)
+        if len(buffer) >= batch_size or (buffer and time.monotonic() - last_flush >= flush_interval):
+            try:
+                flush()
+            except Exception as e:
+                failed = True
+                stats["error"] = f"{type(e).__name__}: {e}"
+                stats["lost"] += len(buffer)
+                buffer.clear()
+
+    try:
+        if buffer:
+            flush()
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+        stats["lost"] += len(buffer)
+    if blob_store is not None:
+        blob_store.close()
+
+
+class ResultSubmitter:
+    """Worker-side handle that buffers results and sends them in batches"""
+
+    def __init__(self, result_queue, batch_size: int = 1000):
+        self.queue = result_queue
+        self.batch_size = batch_size
+        self._buffer: List[Dict] = []
+
+    def submit(self, test_id: str, prompt_version: str, score: float,
+               response_text: str = None, notes: str = None, attributes: Dict = None):
+        """Queue one result (same fields as PromptABTester.record_result)"""
+        self._buffer.append(dict(_RECORD_DEFAULTS, test_id=test_id, prompt_version=prompt_version,
+                                 score=score, response_text=response_text,
+                                 timestamp=datetime.now().isoformat(), notes=notes,
+                                 attributes=attributes))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.queue.put(self._buffer)
+            self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+class ResultIngestionService:
+    """Owns the queue and the single writer process.
+
+    Create it in the parent process, hand `queue` (or `submitter()`) to worker
+    processes, and `close()` it once the workers are done; nothing is lost
+    as long as every submitter is flushed before close.
+    """
+
+    def __init__(self, log_path: str = "ab_test_results.jsonl", batch_size: int = 10000,
+                 flush_interval: float = 0.05, blob_path: str = None, fsync: bool = False):
+        ctx = multiprocessing.get_context()
+        self.log_path = log_path
+        self.queue = ctx.Queue(maxsize=1024)
+        self._manager = ctx.Manager()
+        self._stats = self._manager.dict(written=0, rejected=0, lost=0,
+                                         last_error=None, error=None)
+        self._process = ctx.Process(
+            target=_writer_loop,
+            args=(self.queue, log_path, batch_size, flush_interval, blob_path, fsync, self._stats),
+            daemon=True
+        )
+        self._process.start()
+
+    def submitter(self, batch_size: int = 1000) -> ResultSubmitter:
+        return ResultSubmitter(self.queue, batch_size)
+
+    def written(self) -> int:
+        """Number of results the writer has appended so far"""
+        return self._stats["written"]
+
+    def rejected(self) -> int:
+        """Number of results the writer could not store (see `last_error`)"""
+        return self._stats["rejected"]
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self._stats["last_error"]
+
+    def close(self) -> int:
+        """Stop the writer after it drains the queue; returns results written.
+
+        Raises RuntimeError if the writer failed or exited abnormally.
+        """
+        if self._process.is_alive():
+            self.queue.put(STOP)
+        self._process.join()
+        stats = dict(self._stats)
+        self._manager.shutdown()
+        if stats["error"] is not None or self._process.exitcode != 0:
+            raise RuntimeError(f"Result writer failed (exit code {self._process.exitcode}, "
+                               f"{stats['lost']} results lost): {stats['error']}")
+        return stats["written"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _demo_worker(result_queue, worker_id: int, count: int):
+    with ResultSubmitter(result_queue) as submitter:
+        for i in range(count):
+            submitter.submit("ingest_demo", "A" if i % 2 else "B", 5 + (i % 5), notes=f"worker {worker_id}")
+
+
+# Example usage
+if __name__ == "__main__":
+    if os.path.exists("ab_test_results.jsonl"):
+        os.remove("ab_test_results.jsonl")
+
+    workers, per_worker = 4, 50000
+    started = time.perf_counter()
+    with ResultIngestionService() as service:
+        processes = [multiprocessing.Process(target=_demo_worker, args=(service.queue, w, per_worker))
+                     for w in range(workers)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+    elapsed = time.perf_counter() - started
+
+    results = ResultLog().snapshot("ingest_demo")
+    print(f"Ingested {len(results)} results in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.0f} results/s)")
@@ -0,0 +1,344 @@
+"""
+Scaling Benchmark for the Course Tools
+Drives version control, A/B testing and progress tracking through seeded
+synthetic workloads at increasing scale and records how they behave
+"""
+
+import argparse
+import concurrent.futures
+import copy
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_SCALES = (1000, 10000, 100000, 1000000)
+SEED_CHUNK = 10000
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident memory of this process (None where it cannot be measured)"""
+    try:
+        import resource  # not available on Windows
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)  # peak working set on Windows
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024  # kilobytes on Linux
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except FileNotFoundError:
+                pass  # temp file renamed away meanwhile
+    return total
+
+
+class OpTimer:
+    """Collects per-operation latencies.
+
+    Each operation runs up to `samples` times, but stops early once it has
+    used `budget` seconds, so slow operations at large scales still finish.
+    """
+
+    def __init__(self, samples: int = 50, budget: float = 2.0):
+        self.samples = samples
+        self.budget = budget
+        self.ops: Dict[str, Dict] = {}
+
+    def run(self, name: str, func: Callable[[int], object]):
+        latencies = []
+        started = time.perf_counter()
+        for i in range(self.samples):
+            t0 = time.perf_counter()
+            func(i)
+            latencies.append(time.perf_counter() - t0)
+            if time.perf_counter() - started >= self.budget:
+                break
+        latencies.sort()
+        self.ops[name] = {
+            "count": len(latencies),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 4),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 4),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 4),
+            "max_ms": round(latencies[-1] * 1000, 4)
+        }
+
+
+# ---- Workloads ------------------------------------------------------------
+# Each workload seeds `n` records through the fastest public path, then
+# times individual operations against that state. Seeding cost is reported
+# separately from the per-operation latencies.
+
+def _prompt_text(rng: random.Random, i: int) -> str:
+    words = ("concise", "friendly", "expert", "step-by-step", "formal", "playful", "detailed")
+    return (f"You are a {rng.choice(words)} assistant #{i}. Answer in {rng.randint(1, 5)} "
+            f"paragraphs for {rng.choice(('students', 'managers', 'developers'))}.")
+
+
+def workload_version_control(n: int, rng: random.Random, timer: OpTimer, config: Dict) -> Dict:
+    from prompt_version_control import PromptVersion, PromptVersionControl
+
+    vc = PromptVersionControl("Benchmark", storage_format=config["storage_format"])
+    started = time.perf_counter()
+    base = datetime(2026, 1, 1)
+    parent = None
+    for i in range(n):
+        version_id = f"v_{i:08d}"
+        metrics = {"avg_score": round(rng.uniform(1, 10), 2), "usage_count": rng.randint(0, 500)} \
+            if rng.random() < 0.5 else None
+        vc.versions[version_id] = PromptVersion(
+            version_id, _prompt_text(rng, i), f"Change {i}", rng.choice(("ana", "ben", "chen")),
+            (base + timedelta(seconds=i)).isoformat(), parent, metrics, []
+        )
+        parent = version_id
+    vc.current_version = vc.branches["main"] = parent
+    vc.save_project()
+    seed_seconds = time.perf_counter() - started
+
+    ids = list(vc.versions)
+    timer.run("get_current_prompt", lambda i: vc.get_current_prompt())
+    timer.run("compare_versions", lambda i: vc.compare_versions(rng.choice(ids), rng.choice(ids)))
+    timer.run("find_best_performing_version", lambda i: vc.find_best_performing_version())
+    timer.run("get_version_history", lambda i: vc.get_version_history())
+    timer.run("create_version", lambda i: vc.create_version(f"{_prompt_text(rng, n + i)} ({i})",
+                                                            "Benchmark change", "bench"))
+    timer.run("update_performance_metrics",
+              lambda i: vc.update_performance_metrics(rng.choice(ids), {"avg_score": 5.0}))
+    timer.run("load_project", lambda i: PromptVersionControl("Benchmark"))
+    return {"seed_seconds": seed_seconds}
+
+
+def workload_ab_testing(n: int, rng: random.Random, timer: OpTimer, config: Dict) -> Dict:
+    from ab_testing_framework import PromptABTester, TestResult
+
+    def open_tester():
+        result_log = None
+        if config["result_log"]:
+            from result_ingest import ResultLog
+            result_log = ResultLog("ab_test_results.jsonl")
+        return PromptABTester(result_log=result_log, storage_format=config["storage_format"])
+
+    tester = open_tester()
+    tester.create_test("bench", "Prompt A", "Prompt B", "quality", "Scaling benchmark")
+    started = time.perf_counter()
+    timestamp = datetime(2026, 1, 1).isoformat()
+    for offset in range(0, n, SEED_CHUNK):
+        chunk = [
+            TestResult("bench", "AB"[i & 1], round(rng.uniform(1, 10), 1), f"Response {i}", timestamp,
+                       attributes={"tier": rng.choice(("free", "pro", "team")),
+                                   "language": rng.choice(("en", "de", "es", "ja"))})
+            for i in range(offset, min(n, offset + SEED_CHUNK))
+        ]
+        if tester.result_log is not None:
+            tester.record_results(chunk)
+        else:
+            tester.results.extend(chunk)  # one save below instead of one per chunk
+    if tester.result_log is None:
+        tester.save_data()
+    seed_seconds = time.perf_counter() - started
+
+    timer.run("record_result", lambda i: tester.record_result("bench", "AB"[i & 1], 7.0, f"Extra {i}"))
+    timer.run("analyze_test", lambda i: tester.analyze_test("bench"))
+    timer.run("analyze_segments", lambda i: tester.analyze_segments("bench", by=["tier", "language"]))
+    timer.run("list_tests", lambda i: tester.list_tests())
+    timer.run("load_data", lambda i: open_tester())
+    return {"seed_seconds": seed_seconds}
+
+
+def workload_progress(n: int, rng: random.Random, timer: OpTimer, config: Dict) -> Dict:
+    from cohort_store import CohortProgressStore
+    from progress_tracker import SKILLS_MATRIX_TEMPLATE
+
+    store = CohortProgressStore("cohort_progress.sqlite")
+    weeks = list(SKILLS_MATRIX_TEMPLATE)
+    started = time.perf_counter()
+    now = datetime(2026, 1, 1).isoformat()
+    for offset in range(0, n, SEED_CHUNK):
+        records = []
+        for i in range(offset, min(n, offset + SEED_CHUNK)):
+            skills = copy.deepcopy(SKILLS_MATRIX_TEMPLATE)
+            reached = rng.randrange(len(weeks) + 1)  # students progress through the weeks in order
+            for w, week in enumerate(weeks[:reached + 1]):
+                for skill in skills[week]:
+                    skills[week][skill] = round(rng.uniform(0.5, 1.0) if w < reached else rng.random(), 2)
+            records.append((f"s{i:07d}", {"student_name": f"Student {i}", "last_updated": now,
+                                          "skills_matrix": skills, "assessments": {}, "projects": {}}))
+        store.save_many(records)
+    seed_seconds = time.perf_counter() - started
+
+    def student(i):
+        return f"s{rng.randrange(n):07d}"
+
+    def update(i):
+        week = rng.choice(weeks)
+        tracker = store.tracker(student(i))
+        tracker.update_skill(week, rng.choice(list(SKILLS_MATRIX_TEMPLATE[week])), rng.random())
+
+    timer.run("open_tracker", lambda i: store.tracker(student(i)))
+    timer.run("open_and_update_skill", update)
+    timer.run("get_overall_progress", lambda i: store.tracker(student(i)).get_overall_progress())
+    timer.run("week_completion_rates", lambda i: store.week_completion_rates())
+    timer.run("milestone_counts", lambda i: store.milestone_counts())
+    timer.run("skill_mastery_distribution", lambda i: store.skill_mastery_distribution())
+    timer.run("students_stuck_on", lambda i: store.students_stuck_on(weeks[1]))
+    store.close()
+    return {"seed_seconds": seed_seconds}
+
+
+WORKLOADS = {
+    "version_control": workload_version_control,
+    "ab_testing": workload_ab_testing,
+    "progress": workload_progress
+}
+
+
+def run_one(workload: str, n: int, seed: int, config: Dict) -> Dict:
+    """Run one workload at one scale in a scratch directory (called in a fresh process)"""
+    workdir = tempfile.mkdtemp(prefix=f"bench_{workload}_{n}_", dir=config.get("workdir"))
+    cwd = os.getcwd()
+    os.chdir(workdir)  # every store writes relative to the working directory
+    try:
+        timer = OpTimer(config["samples"], config["op_budget"])
+        started = time.perf_counter()
+        extra = WORKLOADS[workload](n, random.Random(seed), timer, config)
+        wall = time.perf_counter() - started
+        return {
+            "workload": workload,
+            "n": n,
+            "seed": seed,
+            "wall_seconds": round(wall, 3),
+            "seed_seconds": round(extra["seed_seconds"], 3),
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "disk_bytes": _dir_size(workdir),
+            "ops": timer.ops
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmark(workloads: List[str], scales: List[int], seed: int = 42, samples: int = 50,
+                  op_budget: float = 2.0, storage_format: str = "json", result_log: bool = False,
+                  workdir: str = None, progress: Callable[[Dict], None] = None) -> Dict:
+    """Run every workload at every scale, each in its own process so peak RSS is per run"""
+    config = {"samples": samples, "op_budget": op_budget, "storage_format": storage_format,
+              "result_log": result_log, "workdir": workdir}
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for workload in workloads:
+        for n in scales:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                try:
+                    run = pool.submit(run_one, workload, n, seed, config).result()
+                except Exception as e:
+                    run = {"workload": workload, "n": n, "seed": seed, "error": f"{type(e).__name__}: {e}"}
+            runs.append(run)
+            if progress:
+                progress(run)
+    return {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in config.items() if k != "workdir"},
+        "runs": runs
+    }
+
+
+def _slope(xs: List[int], ys: List[float]) -> str:
+    """Log-log slope between the smallest and largest scale (~1 linear, ~0 constant)"""
+    points = [(x, y) for x, y in zip(xs, ys) if y and y > 0]
+    if len(points) < 2:
+        return "-"
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    return f"{math.log(y1 / y0) / math.log(x1 / x0):.2f}"
+
+
+def format_report(report: Dict) -> str:
+    """Scaling curves as text tables, one per workload"""
+    lines = []
+    by_workload: Dict[str, List[Dict]] = {}
+    for run in report["runs"]:
+        by_workload.setdefault(run["workload"], []).append(run)
+
+    for workload, runs in by_workload.items():
+        runs = [r for r in runs if "error" not in r]
+        failed = [r for r in by_workload[workload] if "error" in r]
+        lines.append(f"\n== {workload} ==")
+        for run in failed:
+            lines.append(f"  n={run['n']:,}: FAILED {run['error']}")
+        if not runs:
+            continue
+        scales = [r["n"] for r in runs]
+        header = f"{'':36s}" + "".join(f"{f'n={n:,}':>14s}" for n in scales) + f"{'slope':>8s}"
+        lines.append(header)
+        rows = [
+            ("wall (s)", [r["wall_seconds"] for r in runs]),
+            ("seed (s)", [r["seed_seconds"] for r in runs]),
+            ("peak RSS (MB)", [r["peak_rss_bytes"] / 1e6 if r["peak_rss_bytes"] is not None else None
+                               for r in runs]),
+            ("disk (MB)", [r["disk_bytes"] / 1e6 for r in runs])
+        ]
+        for op in runs[0]["ops"]:
+            rows.append((f"{op} (ms)", [r["ops"].get(op, {}).get("mean_ms") for r in runs]))
+        for label, values in rows:
+            cells = "".join(f"{v:14.3f}" if v is not None else f"{'-':>14s}" for v in values)
+            lines.append(f"{label:36s}{cells}{_slope(scales, values):>8s}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--workloads", default=",".join(WORKLOADS),
+                        help=f"comma-separated subset of {', '.join(WORKLOADS)}")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated record counts (e.g. 1000,10000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=50, help="timed calls per operation")
+    parser.add_argument("--op-budget", type=float, default=2.0, help="max seconds per operation")
+    parser.add_argument("--storage-format", default="json", choices=("json", "compact", "binary"))
+    parser.add_argument("--result-log", action="store_true", help="A/B results in an append-only log")
+    parser.add_argument("--workdir", help="where scratch directories are created (default: system temp)")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    workloads = args.workloads.split(",")
+    unknown = [w for w in workloads if w not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(unknown)}")
+    scales = [int(float(s)) for s in args.scales.split(",")]
+
+    def progress(run):
+        rss = f"{run['peak_rss_bytes'] / 1e6:.0f} MB RSS" if run.get("peak_rss_bytes") is not None else "RSS n/a"
+        status = run.get("error") or f"{run['wall_seconds']}s, {rss}"
+        print(f"  {run['workload']} n={run['n']:,}: {status}", flush=True)
+
+    report = run_benchmark(workloads, scales, args.seed, args.samples, args.op_budget,
+                           args.storage_format, args.result_log, args.workdir, progress)
+    print(format_report(report))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+    return 0
+
+
+# Example usage: python scaling_benchmark.py --scales 1000,10000 --output before.json
+if __name__ == "__main__":
+    sys.exit(main())
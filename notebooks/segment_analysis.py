@@ -0,0 +1,236 @@
+"""
+Segmented Analysis for Prompt A/B Tests
+Break results down by customer tier, language, input length, etc.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+MISSING = "(none)"
+
+
+def bucket_label(value: float, edges: Sequence[float]) -> str:
+    """Label a numeric value with its range, e.g. 120 with [100, 500] -> '100-500'"""
+    idx = bisect_right(edges, value)
+    if idx == 0:
+        return f"<{edges[0]:g}"
+    if idx == len(edges):
+        return f">={edges[-1]:g}"
+    return f"{edges[idx - 1]:g}-{edges[idx]:g}"
+
+
+class ResultColumns:
+    """Columnar, dictionary-encoded view of one test's results.
+
+    Every grouping dimension becomes an array of small integer codes so
+    group-by is a single pass over flat arrays instead of one scan per segment.
+    """
+
+    def __init__(self, results: Iterable, test_id: str, dimensions: List[str],
+                 numeric_buckets: Dict[str, Sequence[float]] = None):
+        numeric_buckets = numeric_buckets or {}
+        self.dimensions = dimensions
+        self.labels: List[List[str]] = [[] for _ in dimensions]
+        self.arms = array("b")
+        self.scores = array("d")
+        self.codes = [array("i") for _ in dimensions]
+        lookups: List[Dict[str, int]] = [{} for _ in dimensions]
+
+        for result in results:
+            if result.test_id != test_id or result.prompt_version not in ("A", "B"):
+                continue
+            attributes = result.attributes or {}
+            self.arms.append(0 if result.prompt_version == "A" else 1)
+            self.scores.append(result.score)
+            for i, dim in enumerate(dimensions):
+                value = attributes.get(dim)
+                if value is None:
+                    label = MISSING
+                elif dim in numeric_buckets:
+                    label = bucket_label(float(value), numeric_buckets[dim])
+                else:
+                    label = str(value)
+                code = lookups[i].get(label)
+                if code is None:
+                    code = lookups[i][label] = len(self.labels[i])
+                    self.labels[i].append(label)
+                self.codes[i].append(code)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def group_codes(self) -> Tuple[array, List[Tuple[int, ...]]]:
+        """Dense group id per result, and each group's per-dimension codes.
+
+        Ids are assigned to the code combinations that actually occur, so
+        they stay small however many labels each dimension has.
+        """
+        if not self.codes:
+            return array("i", bytes(4 * len(self))), [()]
+        ids: Dict[Tuple[int, ...], int] = {}
+        groups = array("i")
+        for key in zip(*self.codes):
+            group = ids.get(key)
+            if group is None:
+                group = ids[key] = len(ids)
+            groups.append(group)
+        return groups, list(ids)
+
+    def group_label(self, key: Tuple[int, ...]) -> Dict[str, str]:
+        return {dim: labels[code] for dim, labels, code in zip(self.dimensions, self.labels, key)}
+
+
+def _arm_stats(count: int, total: float, total_sq: float) -> Dict:
+    mean = total / count if count else 0.0
+    variance = (total_sq - count * mean * mean) / (count - 1) if count > 1 else 0.0
+    return {
+        "count": count,
+        "mean_score": round(mean, 2),
+        "std_dev": round(math.sqrt(max(variance, 0.0)), 2),
+        "_mean": mean,
+        "_var": max(variance, 0.0)
+    }
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta function"""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def t_p_value(t: float, df: float) -> float:
+    """Two-sided p-value of a t statistic with `df` degrees of freedom"""
+    return _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def welch_p_value(a: Dict, b: Dict) -> float:
+    """Two-sided p-value of Welch's t-test (t distribution, Welch-Satterthwaite df)"""
+    if a["count"] < 2 or b["count"] < 2:
+        return 1.0
+    va, vb = a["_var"] / a["count"], b["_var"] / b["count"]
+    se = math.sqrt(va + vb)
+    if se == 0:
+        return 0.0 if a["_mean"] != b["_mean"] else 1.0
+    t = (b["_mean"] - a["_mean"]) / se
+    df = (va + vb) ** 2 / (va * va / (a["count"] - 1) + vb * vb / (b["count"] - 1))
+    return t_p_value(t, df)
+
+
+def analyze_segments(results: Iterable, test_id: str, by: List[str],
+                     numeric_buckets: Dict[str, Sequence[float]] = None,
+                     alpha: float = 0.05, min_count: int = 2) -> Dict:
+    """Per-segment A/B statistics and significance in one pass over the results.
+
+    `by` names keys of TestResult.attributes; `numeric_buckets` turns numeric
+    attributes (e.g. input_length) into ranges. Segments where either arm has
+    fewer than `min_count` results are reported but never marked significant.
+    Significance is also reported with a Bonferroni correction for the number
+    of segments tested.
+    """
+    columns = ResultColumns(results, test_id, by, numeric_buckets)
+    if not len(columns):
+        return {"error": "No results found for this test"}
+
+    group_ids, group_keys = columns.group_codes()
+    counts: Dict[int, List[float]] = {}  # group*2+arm -> [count, sum, sum_sq]
+    for group, arm, score in zip(group_ids, columns.arms, columns.scores):
+        acc = counts.get(group * 2 + arm)
+        if acc is None:
+            acc = counts[group * 2 + arm] = [0, 0.0, 0.0]
+        acc[0] += 1
+        acc[1] += score
+        acc[2] += score * score
+
+    groups = sorted({key // 2 for key in counts}, key=lambda g: group_keys[g][::-1])
+    tested = sum(
+        1 for g in groups
+        if counts.get(g * 2, [0])[0] >= min_count and counts.get(g * 2 + 1, [0])[0] >= min_count
+    )
+    segments = []
+    for group in groups:
+        a = _arm_stats(*counts.get(group * 2, [0, 0.0, 0.0]))
+        b = _arm_stats(*counts.get(group * 2 + 1, [0, 0.0, 0.0]))
+        enough = a["count"] >= min_count and b["count"] >= min_count
+        p_value = welch_p_value(a, b) if enough else None
+        difference = b["_mean"] - a["_mean"]
+
+        if not enough:
+            winner = "Insufficient data"
+        elif abs(difference) < 0.5:
+            winner = "Tie"
+        else:
+            winner = "B" if difference > 0 else "A"
+
+        for arm in (a, b):
+            del arm["_mean"], arm["_var"]
+        segments.append({
+            "segment": columns.group_label(group_keys[group]),
+            "prompt_a": a,
+            "prompt_b": b,
+            "difference": round(difference, 2),
+            "winner": winner,
+            "p_value": round(p_value, 4) if p_value is not None else None,
+            "significant": p_value is not None and p_value < alpha,
+            "significant_corrected": p_value is not None and p_value < alpha / max(tested, 1)
+        })
+
+    return {
+        "test_id": test_id,
+        "dimensions": by,
+        "total_results": len(columns),
+        "segments_tested": tested,
+        "segments": segments
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    from ab_testing_framework import TestResult
+
+    rng = random.Random(7)
+    results = []
+    for i in range(200000):
+        tier = rng.choice(["free", "pro", "enterprise"])
+        language = rng.choice(["en", "es", "de"])
+        version = rng.choice("AB")
+        lift = 1.5 if version == "B" and tier == "enterprise" else 0.0
+        results.append(TestResult(
+            test_id="support_reply_test", prompt_version=version,
+            score=min(10, max(1, rng.gauss(6 + lift, 1.5))), response_text=None,
+            timestamp="", attributes={"tier": tier, "language": language,
+                                      "input_length": rng.randint(10, 3000)}
+        ))
+
+    analysis = analyze_segments(results, "support_reply_test", ["tier", "input_length"],
+                                numeric_buckets={"input_length": [200, 1000]})
+    for seg in analysis["segments"]:
+        print(seg["segment"], seg["winner"], seg["difference"], seg["p_value"],
+              "significant" if seg["significant_corrected"] else "")
@@ -0,0 +1,165 @@
+"""
+Deterministic Traffic Assignment for Prompt A/B Tests
+Hash-based sticky routing of users (or any unit) to prompt versions
+"""
+
+import hashlib
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BUCKET_COUNT = 10000  # 0.01% traffic granularity
+DEFAULT_WEIGHTS = {"A": 0.5, "B": 0.5}
+
+
+def _hash_prefix(test_id: str, salt: str):
+    """Pre-hashed prefix shared by every unit of one test/salt pair"""
+    return hashlib.md5(f"{test_id}:{salt}:".encode())
+
+
+def _bucket(prefix, unit_id: str, buckets: int = BUCKET_COUNT) -> int:
+    """Finish a prefix hash with the unit id and map it to a bucket"""
+    h = prefix.copy()
+    h.update(str(unit_id).encode())
+    return int.from_bytes(h.digest()[:8], "big") % buckets
+
+
+def hash_to_bucket(test_id: str, unit_id: str, salt: str = "",
+                   buckets: int = BUCKET_COUNT) -> int:
+    """Map (test_id, unit_id, salt) to a stable bucket in [0, buckets)"""
+    return _bucket(_hash_prefix(test_id, salt), unit_id, buckets)
+
+
+def _thresholds(weights: Dict[str, float]) -> Tuple[List[str], List[int]]:
+    """Turn arm weights into cumulative bucket boundaries"""
+    if not weights:
+        raise ValueError("At least one arm weight is required")
+    total = sum(weights.values())
+    if total <= 0 or any(w < 0 for w in weights.values()):
+        raise ValueError("Arm weights must be non-negative and sum to more than 0")
+
+    arms, bounds, running = [], [], 0.0
+    for arm, weight in weights.items():
+        running += weight
+        arms.append(arm)
+        bounds.append(round(running / total * BUCKET_COUNT))
+    bounds[-1] = BUCKET_COUNT
+    return arms, bounds
+
+
+def _check_traffic(traffic: float):
+    if not 0 <= traffic <= 1:
+        raise ValueError("Traffic must be between 0.0 and 1.0")
+
+
+def assign_variant(test_id: str, unit_id: str, weights: Dict[str, float] = None,
+                   traffic: float = 1.0, salt: str = "") -> Optional[str]:
+    """Return the sticky arm for a unit, or None if it falls outside the traffic share.
+
+    Exposure and arm choice use independent hashes, so ramping traffic up
+    only adds new units and never moves an already-assigned unit to another arm.
+    """
+    return assign_bulk(test_id, [unit_id], weights, traffic, salt)[0]
+
+
+def assign_bulk(test_id: str, unit_ids: Iterable[str], weights: Dict[str, float] = None,
+                traffic: float = 1.0, salt: str = "") -> List[Optional[str]]:
+    """Assign many units in one call (same results as assign_variant per unit)"""
+    _check_traffic(traffic)
+    arms, bounds = _thresholds(weights or DEFAULT_WEIGHTS)
+    exposure_prefix = _hash_prefix(test_id, f"{salt}:traffic")
+    arm_prefix = _hash_prefix(test_id, salt)
+    exposure_limit = round(traffic * BUCKET_COUNT)
+
+    assignments = []
+    for unit_id in unit_ids:
+        if exposure_limit < BUCKET_COUNT and _bucket(exposure_prefix, unit_id) >= exposure_limit:
+            assignments.append(None)
+        else:
+            assignments.append(arms[bisect_right(bounds, _bucket(arm_prefix, unit_id))])
+    return assignments
+
+
+class ExperimentLayer:
+    """A set of mutually exclusive experiments sharing one slice of traffic.
+
+    Every unit hashes to one bucket in the layer; each experiment owns a
+    contiguous range of buckets, so a unit is in at most one experiment per layer.
+    Units in different layers are assigned independently.
+    """
+
+    def __init__(self, layer_id: str, salt: str = ""):
+        self.layer_id = layer_id
+        self.salt = salt
+        self.experiments: Dict[str, Dict] = {}  # test_id -> {start, end, weights}
+        self._allocated = 0
+
+    def add_experiment(self, test_id: str, share: float,
+                       weights: Dict[str, float] = None) -> bool:
+        """Reserve a share (0-1) of the layer's traffic for an experiment"""
+        if test_id in self.experiments:
+            return False
+        _check_traffic(share)
+        size = round(share * BUCKET_COUNT)
+        if self._allocated + size > BUCKET_COUNT:
+            return False
+
+        _thresholds(weights or DEFAULT_WEIGHTS)  # validate early
+        self.experiments[test_id] = {
+            "start": self._allocated,
+            "end": self._allocated + size,
+            "weights": weights or dict(DEFAULT_WEIGHTS),
+        }
+        self._allocated += size
+        return True
+
+    def remaining_share(self) -> float:
+        """Fraction of the layer not yet reserved by any experiment"""
+        return (BUCKET_COUNT - self._allocated) / BUCKET_COUNT
+
+    def assign(self, unit_id: str) -> Optional[Tuple[str, str]]:
+        """Return (test_id, arm) for a unit, or None if it is in no experiment"""
+        return self.assign_bulk([unit_id])[0]
+
+    def assign_bulk(self, unit_ids: Iterable[str]) -> List[Optional[Tuple[str, str]]]:
+        """Assign many units to (test_id, arm) pairs in one call"""
+        # Empty ranges (share 0, or rounded to no buckets) would shadow the next experiment's start
+        starts = sorted((exp["start"], tid) for tid, exp in self.experiments.items()
+                        if exp["end"] > exp["start"])
+        start_bounds = [start for start, _ in starts]
+        compiled = {
+            tid: (_hash_prefix(tid, f"{self.salt}:{self.layer_id}"), _thresholds(exp["weights"]))
+            for tid, exp in self.experiments.items()
+        }
+        layer_prefix = _hash_prefix(self.layer_id, self.salt)
+
+        assignments = []
+        for unit_id in unit_ids:
+            bucket = _bucket(layer_prefix, unit_id)
+            idx = bisect_right(start_bounds, bucket) - 1
+            if idx < 0:
+                assignments.append(None)
+                continue
+            test_id = starts[idx][1]
+            if bucket >= self.experiments[test_id]["end"]:
+                assignments.append(None)
+                continue
+            arm_prefix, (arms, bounds) = compiled[test_id]
+            assignments.append((test_id, arms[bisect_right(bounds, _bucket(arm_prefix, unit_id))]))
+        return assignments
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Sticky:", [assign_variant("email_subject_test", "user_42") for _ in range(3)])
+    print("90/10 split at 50% traffic:",
+          assign_variant("email_subject_test", "user_42", {"A": 0.9, "B": 0.1}, traffic=0.5))
+
+    users = [f"user_{i}" for i in range(100000)]
+    arms = assign_bulk("email_subject_test", users)
+    print("Bulk split:", {arm: arms.count(arm) for arm in ("A", "B")})
+
+    layer = ExperimentLayer("onboarding")
+    layer.add_experiment("welcome_email_test", 0.3)
+    layer.add_experiment("tooltip_copy_test", 0.3, {"A": 1, "B": 1, "C": 1})
+    print("Layer assignment:", layer.assign("user_42"))
+    print("Remaining layer share:", layer.remaining_share())
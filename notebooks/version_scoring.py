@@ -0,0 +1,179 @@
+"""
+Background Scoring of Prompt Versions
+Scores new versions with PromptValidator off the commit path
+"""
+
+import atexit
+import concurrent.futures
+import hashlib
+import threading
+import weakref
+from typing import Dict, List, Tuple
+
+VALIDATOR_SCORE = "validator_score"
+VALIDATOR_GRADE = "validator_grade"
+
+_validator = None
+_open_scorers = weakref.WeakSet()
+
+@atexit.register
+def _flush_all_scorers():
+    """Save scores still waiting for a coalesced save at interpreter exit"""
+    for scorer in list(_open_scorers):
+        scorer.save_pending()
+
+def _score_text(prompt_text: str) -> Tuple[float, str]:
+    """Score one prompt text (runs in a worker thread or process)"""
+    global _validator
+    if _validator is None:
+        from prompt_validator import PromptValidator
+        _validator = PromptValidator()
+    result = _validator.score_prompt(prompt_text)
+    return result['overall_score'], result['grade']
+
+def content_hash(prompt_text: str) -> str:
+    return hashlib.md5(prompt_text.encode()).hexdigest()
+
+
+class VersionScorer:
+    """Scores prompt versions in the background and stores the results in
+    their performance_metrics as `validator_score` and `validator_grade`.
+
+    Texts are deduplicated by content hash: a text already scored (or being
+    scored) is never submitted again, its versions just share the result.
+    Scores are applied under the project's lock and saved with one coalesced
+    save_project per `save_delay` seconds instead of one save per version.
+
+    Threads suit the occasional create_version; use processes=True to score
+    bulk imports of thousands of versions in parallel.
+    """
+
+    def __init__(self, max_workers: int = None, processes: bool = False, save_delay: float = 0.5):
+        if processes:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers or 1)
+        self.save_delay = save_delay
+        self.scored = 0  # texts actually scored (not served from the dedup cache)
+        self.failed = 0  # texts whose scoring raised; their versions stay unscored
+        self.last_error = None  # "ExceptionType: message" of the latest failure
+        self._scores: Dict[str, Tuple[float, str]] = {}  # content hash -> (score, grade)
+        self._waiting: Dict[str, List[Tuple[object, str]]] = {}  # content hash -> [(project, version_id)]
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._dirty_projects = {}  # id(project) -> project awaiting a save
+        self._save_timer = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        _open_scorers.add(self)
+
+    def submit(self, project, version_id: str, prompt_text: str):
+        """Queue a version for scoring; returns immediately"""
+        key = content_hash(prompt_text)
+        with self._lock:
+            known = self._scores.get(key)
+            if known is None:
+                self._waiting.setdefault(key, []).append((project, version_id))
+                if key in self._futures:
+                    return
+                future = self._executor.submit(_score_text, prompt_text)
+                self._futures[key] = future
+        if known is not None:
+            self._apply(project, version_id, *known)
+            return
+        future.add_done_callback(lambda f, key=key: self._scored(key, f))
+
+    def score_missing(self, project) -> int:
+        """Queue every version of a project that has no validator score yet"""
+        missing = [(vid, v.prompt_text) for vid, v in project.versions.items()
+                   if VALIDATOR_SCORE not in (v.performance_metrics or {})]
+        for version_id, prompt_text in missing:
+            self.submit(project, version_id, prompt_text)
+        return len(missing)
+
+    def _scored(self, key: str, future: concurrent.futures.Future):
+        error = concurrent.futures.CancelledError() if future.cancelled() else future.exception()
+        with self._lock:
+            waiting = self._waiting.pop(key, [])
+            if error is not None:  # leave the versions unscored; score_missing can retry them
+                self.failed += 1
+                self.last_error = f"{type(error).__name__}: {error}"
+                del self._futures[key]
+                self._idle.notify_all()
+                return
+            score, grade = self._scores[key] = future.result()
+            self.scored += 1
+        for project, version_id in waiting:
+            self._apply(project, version_id, score, grade)
+        with self._lock:
+            del self._futures[key]
+            self._idle.notify_all()
+
+    def _apply(self, project, version_id: str, score: float, grade: str):
+        with project._lock:
+            version = project.versions.get(version_id)
+            if version is None:
+                return
+            metrics = version.performance_metrics
+            if metrics is None:
+                metrics = version.performance_metrics = {}
+            if metrics.get(VALIDATOR_SCORE) == score and metrics.get(VALIDATOR_GRADE) == grade:
+                return
+            metrics[VALIDATOR_SCORE] = score
+            metrics[VALIDATOR_GRADE] = grade
+        with self._lock:
+            self._dirty_projects[id(project)] = project
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.save_pending)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def save_pending(self):
+        """Save every project that received scores since its last save"""
+        with self._lock:
+            projects = list(self._dirty_projects.values())
+            self._dirty_projects.clear()
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        for project in projects:
+            project.save_project()
+
+    @property
+    def pending(self) -> int:
+        """Texts still being scored"""
+        return len(self._futures)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until everything submitted so far is scored and saved"""
+        with self._lock:
+            done = self._idle.wait_for(lambda: not self._futures, timeout)
+        self.save_pending()
+        return done
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
+        _open_scorers.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from prompt_version_control import PromptVersionControl
+
+    with VersionScorer(processes=True) as scorer:
+        vc = PromptVersionControl("Scoring Demo", scorer=scorer)
+        started = time.perf_counter()
+        vc.create_version("Write about dogs", "Initial", "Sam")
+        vc.create_version("You are a vet. Write 200 words about dog nutrition for new owners. "
+                          "Must include feeding amounts.", "Specific", "Sam")
+        print(f"Two commits in {(time.perf_counter() - started) * 1000:.1f} ms (not blocked by scoring)")
+    for version in vc.get_version_history():
+        print(version["version_id"], vc.get_version(version["version_id"]).performance_metrics)
+    print("Best version:", vc.find_best_performing_version())
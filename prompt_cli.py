@@ -0,0 +1,230 @@
+"""
+Command-line interface for the course tools
+Run `python prompt_cli.py --help` to see every subcommand
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Course modules live in notebooks/ and are imported lazily per subcommand,
+# so `--help` and simple queries don't pay for modules they don't use.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "notebooks"))
+
+
+def emit(args, data, text: str = None):
+    """Print JSON in --json mode, otherwise the human-readable text"""
+    if args.json:
+        print(json.dumps(data, indent=2, default=str))
+    else:
+        print(text if text is not None else data)
+
+
+def read_prompt(args) -> str:
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            return f.read()
+    if args.prompt in (None, "-"):
+        return sys.stdin.read()
+    return args.prompt
+
+
+# ---- validate -------------------------------------------------------------
+
+def cmd_validate(args) -> int:
+    from prompt_validator import PromptValidator
+
+    prompt = read_prompt(args)
+    if not prompt.strip():
+        print("prompt_cli validate: error: no prompt given (pass it as an argument, "
+              "with --file, or on stdin)", file=sys.stderr)
+        return 2
+    result = PromptValidator().score_prompt(prompt)
+    lines = [f"Score: {result['overall_score']} - {result['grade']}"]
+    lines += [f"  {name}: {score:.2f}" for name, score in result['breakdown'].items()]
+    lines += ["Feedback:"] + [f"  {item}" for item in result['feedback']]
+    emit(args, result, "\n".join(lines))
+    return 0
+
+
+# ---- version --------------------------------------------------------------
+
+def cmd_version(args) -> int:
+    from prompt_version_control import PromptVersionControl
+
+    vc = PromptVersionControl(args.project)
+
+    if args.version_command == "log":
+        history = vc.get_version_history()[:args.limit]
+        text = "\n".join(
+            f"{'*' if v['is_current'] else ' '} {v['version_id']}  {v['timestamp']}  "
+            f"{v['author']}: {v['description']}"
+            for v in history
+        ) or "No versions yet"
+        emit(args, history, text)
+        return 0
+
+    if args.version_command == "diff":
+        comparison = vc.compare_versions(args.version1, args.version2)
+        if "error" in comparison:
+            emit(args, comparison, comparison["error"])
+            return 1
+        text = (f"Similarity: {comparison['similarity']}%\n"
+                f"Added: {' '.join(comparison['word_diff']['added'])}\n"
+                f"Removed: {' '.join(comparison['word_diff']['removed'])}")
+        emit(args, comparison, text)
+        return 0
+
+    if args.version_command == "rollback":
+        ok = vc.rollback_to_version(args.version_id)
+        emit(args, {"rolled_back": ok, "current_version": vc.current_version},
+             f"Current version: {vc.current_version}" if ok else f"Version {args.version_id} not found")
+        return 0 if ok else 1
+
+    if args.version_command == "branch":
+        if args.name is None:
+            text = "\n".join(f"{'*' if b == vc.current_branch else ' '} {b} -> {v}"
+                             for b, v in vc.branches.items())
+            emit(args, {"branches": vc.branches, "current_branch": vc.current_branch}, text)
+            return 0
+        ok = vc.create_branch(args.name, args.from_version)
+        emit(args, {"created": ok, "branch": args.name, "version": vc.branches.get(args.name)},
+             f"Created branch {args.name}" if ok else f"Branch {args.name} already exists")
+        return 0 if ok else 1
+    return 2
+
+
+# ---- abtest ---------------------------------------------------------------
+
+def cmd_abtest(args) -> int:
+    from ab_testing_framework import PromptABTester
+
+    tester = PromptABTester()
+
+    if args.abtest_command == "create":
+        test = tester.create_test(args.test_id, args.prompt_a, args.prompt_b, args.metric, args.description)
+        emit(args, vars(test), f"Created test {test.test_id}")
+        return 0
+
+    if args.abtest_command == "record":
+        if args.test_id not in tester.tests:
+            emit(args, {"error": f"Test {args.test_id} not found"}, f"Test {args.test_id} not found")
+            return 1
+        tester.record_result(args.test_id, args.version, args.score, args.response, args.notes)
+        emit(args, {"recorded": True}, f"Recorded {args.version}={args.score} for {args.test_id}")
+        return 0
+
+    if args.abtest_command == "analyze":
+        analysis = tester.analyze_test(args.test_id)
+        text = tester.generate_report(args.test_id) if "error" not in analysis else analysis["error"]
+        emit(args, analysis, text)
+        return 1 if "error" in analysis else 0
+
+    if args.abtest_command == "list":
+        tests = tester.list_tests()
+        text = "\n".join(f"{t['test_id']}  {t['results_count']} results  {t['description']}"
+                         for t in tests) or "No tests yet"
+        emit(args, tests, text)
+        return 0
+    return 2
+
+
+# ---- progress -------------------------------------------------------------
+
+def cmd_progress(args) -> int:
+    from progress_tracker import ProgressTracker
+
+    tracker = ProgressTracker(args.student, progress_file=args.file)
+
+    if args.progress_command == "show":
+        progress = tracker.get_overall_progress()
+        emit(args, progress, "\n".join(f"{k.replace('_', ' ').title()}: {v}" for k, v in progress.items()))
+        return 0
+
+    if args.progress_command == "update":
+        ok = tracker.update_skill(args.week, args.skill, args.score)
+        emit(args, {"updated": ok, **tracker.get_overall_progress()},
+             f"Updated {args.week}/{args.skill}" if ok else f"Unknown skill {args.week}/{args.skill}")
+        return 0 if ok else 1
+
+    if args.progress_command == "report":
+        emit(args, {"skills_matrix": tracker.skills_matrix}, tracker.generate_skill_report())
+        return 0
+    return 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="prompt_cli", description="Prompt Engineering Mastery tools")
+    parser.add_argument("--json", action="store_true", help="machine-readable JSON output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="score a prompt with the CLEAR framework")
+    validate.add_argument("prompt", nargs="?", help="prompt text ('-' or omitted reads stdin)")
+    validate.add_argument("-f", "--file", help="read the prompt from a file")
+    validate.set_defaults(handler=cmd_validate)
+
+    version = commands.add_parser("version", help="prompt version control")
+    version.add_argument("-p", "--project", required=True, help="project name")
+    version_commands = version.add_subparsers(dest="version_command", required=True)
+    log = version_commands.add_parser("log", help="version history, newest first")
+    log.add_argument("-n", "--limit", type=int, default=None)
+    diff = version_commands.add_parser("diff", help="compare two versions")
+    diff.add_argument("version1")
+    diff.add_argument("version2")
+    rollback = version_commands.add_parser("rollback", help="make a version current")
+    rollback.add_argument("version_id")
+    branch = version_commands.add_parser("branch", help="list branches, or create one")
+    branch.add_argument("name", nargs="?")
+    branch.add_argument("--from", dest="from_version", help="base version (default: current)")
+    version.set_defaults(handler=cmd_version)
+
+    abtest = commands.add_parser("abtest", help="A/B tests of prompt versions")
+    abtest_commands = abtest.add_subparsers(dest="abtest_command", required=True)
+    create = abtest_commands.add_parser("create", help="create a test")
+    create.add_argument("test_id")
+    create.add_argument("--prompt-a", required=True)
+    create.add_argument("--prompt-b", required=True)
+    create.add_argument("--metric", default="quality")
+    create.add_argument("--description", default="")
+    record = abtest_commands.add_parser("record", help="record one result")
+    record.add_argument("test_id")
+    record.add_argument("version", choices=["A", "B"])
+    record.add_argument("score", type=float)
+    record.add_argument("--response", default="")
+    record.add_argument("--notes")
+    analyze = abtest_commands.add_parser("analyze", help="analyze a test")
+    analyze.add_argument("test_id")
+    abtest_commands.add_parser("list", help="list tests")
+    abtest.set_defaults(handler=cmd_abtest)
+
+    progress = commands.add_parser("progress", help="course progress tracking")
+    progress.add_argument("-s", "--student", default="Student")
+    progress.add_argument("--file", default="progress.json", help="progress file")
+    progress_commands = progress.add_subparsers(dest="progress_command", required=True)
+    progress_commands.add_parser("show", help="overall progress")
+    update = progress_commands.add_parser("update", help="update a skill score (0-1)")
+    update.add_argument("week")
+    update.add_argument("skill")
+    update.add_argument("score", type=float)
+    progress_commands.add_parser("report", help="detailed skill report")
+    progress.set_defaults(handler=cmd_progress)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        code = args.handler(args)
+        sys.stdout.flush()  # surface a closed pipe here rather than at interpreter exit
+        return code
+    except BrokenPipeError:  # e.g. piped into `head`
+        # Point stdout at devnull so the flush at exit doesn't fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
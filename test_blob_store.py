@@ -0,0 +1,48 @@
+"""
+Test the blob store's single-writer / many-reader behavior
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from blob_store import BlobStore
+
+def test_reader_keeps_partial_frame_and_sees_later_appends(tmp_path):
+    path = str(tmp_path / "blobs.seg")
+    writer = BlobStore(path)
+    first = writer.put("first response")
+    writer.flush()
+
+    with open(path, "ab") as f:  # the writer is halfway through its next frame
+        f.write(b"PB")
+    size = os.path.getsize(path)
+
+    reader = BlobStore(path)
+    assert os.path.getsize(path) == size  # opening a reader must not cut the frame
+    assert reader.get(first) == "first response"
+
+    with open(path, "r+b") as f:  # (drop the stray bytes the test wrote)
+        f.truncate(size - 2)
+    second = writer.put("second response")
+    writer.flush()
+    assert reader.get(second) == "second response"  # found by rescanning on a miss
+    writer.close()
+    reader.close()
+
+def test_first_put_repairs_torn_tail(tmp_path):
+    path = str(tmp_path / "blobs.seg")
+    store = BlobStore(path)
+    ref = store.put("kept")
+    store.close()
+    with open(path, "ab") as f:  # crashed mid-frame
+        f.write(b"PBz" + b"\x00" * 10)
+
+    store = BlobStore(path)
+    new_ref = store.put("after the crash")
+    store.close()
+
+    store = BlobStore(path)
+    assert store.get(ref) == "kept"
+    assert store.get(new_ref) == "after the crash"
+    store.close()
@@ -0,0 +1,25 @@
+"""
+Test atomic data file writes
+"""
+
+import os
+import stat
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import codec
+
+def test_dump_keeps_existing_file_mode(tmp_path):
+    path = str(tmp_path / "data.json")
+    codec.dump({"a": 1}, path)
+    os.chmod(path, 0o640)
+    codec.dump({"a": 2}, path, fmt="binary")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert codec.load(path) == {"a": 2}
+
+def test_new_files_get_umask_mode_without_touching_umask(tmp_path):
+    with open(tmp_path / "plain.txt", "w"):
+        pass
+    codec.dump([1, 2], str(tmp_path / "new.json"))
+    expected = stat.S_IMODE(os.stat(tmp_path / "plain.txt").st_mode)
+    assert stat.S_IMODE(os.stat(tmp_path / "new.json").st_mode) == expected
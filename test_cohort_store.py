@@ -0,0 +1,86 @@
+"""
+Test cohort analytics against per-tracker results
+"""
+
+import copy
+import os
+import random
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+from cohort_store import CohortProgressStore
+from progress_tracker import MASTERY_THRESHOLD, SKILLS_MATRIX_TEMPLATE
+
+def _milestone(week):
+    return f"Focus on {week.replace('_', ' ').title()}" if week != "complete" else "Ready for advanced projects!"
+
+@pytest.fixture(scope="module")
+def cohort(tmp_path_factory):
+    rng = random.Random(33)
+    store = CohortProgressStore(str(tmp_path_factory.mktemp("cohort") / "cohort.sqlite"))
+    records = []
+    for i in range(500):
+        skills_matrix = copy.deepcopy(SKILLS_MATRIX_TEMPLATE)
+        skill_level = rng.random()
+        for skills in skills_matrix.values():
+            for skill in skills:
+                skills[skill] = rng.choice([0, 0.3, 0.69, 0.7, 0.9, 1.0]) if rng.random() < skill_level else 1.0
+        records.append((f"s{i:03d}", {
+            'student_name': f"Student {i}",
+            'last_updated': f"2026-0{1 + i % 3}-01T00:00:00",
+            'skills_matrix': skills_matrix,
+            'assessments': {},
+            'projects': {}
+        }))
+    store.save_many(records)
+    yield store, dict(records)
+    store.close()
+
+def test_milestone_counts_match_trackers(cohort):
+    store, records = cohort
+    expected = {}
+    for student_id in records:
+        milestone = store.tracker(student_id)._get_next_milestone()
+        expected[milestone] = expected.get(milestone, 0) + 1
+    counts = store.milestone_counts()
+    assert {_milestone(week): n for week, n in counts.items()} == expected
+    assert sum(counts.values()) == 500
+
+def test_week_completion_rates(cohort):
+    store, records = cohort
+    rates = store.week_completion_rates()
+    assert list(rates) == list(SKILLS_MATRIX_TEMPLATE)
+    for week, rate in rates.items():
+        completed = sum(
+            sum(s >= MASTERY_THRESHOLD for s in data['skills_matrix'][week].values())
+            / len(data['skills_matrix'][week]) >= 0.8
+            for data in records.values())
+        assert rate == {"students": 500, "completed": completed, "completion_rate": round(completed / 500, 3)}
+
+def test_students_stuck_on(cohort):
+    store, records = cohort
+    week = next(iter(SKILLS_MATRIX_TEMPLATE))
+    stuck = [sid for sid in records if store.tracker(sid)._get_next_milestone() == _milestone(week)]
+    assert store.students_stuck_on(week) == sorted(stuck)
+    inactive = [sid for sid in stuck if records[sid]['last_updated'] < "2026-02-01"]
+    assert store.students_stuck_on(week, inactive_since="2026-02-01") == sorted(inactive)
+    assert 0 < len(inactive) < len(stuck)
+
+def test_skill_mastery_distribution(cohort):
+    store, records = cohort
+    distribution = store.skill_mastery_distribution()
+    assert len(distribution) == sum(len(skills) for skills in SKILLS_MATRIX_TEMPLATE.values())
+    for row in distribution:
+        scores = [data['skills_matrix'][row["week"]][row["skill"]] for data in records.values()]
+        mastered = sum(s >= MASTERY_THRESHOLD for s in scores)
+        assert row["students"] == 500
+        assert row["mean_score"] == round(sum(scores) / 500, 3)
+        assert row["mastery_rate"] == round(mastered / 500, 3)
+        assert row["histogram"] == {
+            "not_started": scores.count(0),
+            "beginning": sum(0 < s < 0.4 for s in scores),
+            "developing": sum(0.4 <= s < MASTERY_THRESHOLD for s in scores),
+            "mastered": mastered
+        }
@@ -0,0 +1,55 @@
+"""
+Test the async experiment runner
+"""
+
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from ab_testing_framework import PromptABTester
+from experiment_runner import ExperimentRunner, LocalStubBackend
+from response_cache import ResponseCache
+
+def test_grader_errors_are_counted_and_results_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = PromptABTester()
+    tester.create_test("runner", "Prompt A", "Prompt B", "quality", "Runner test")
+    calls = {"n": 0}
+
+    def grader(prompt, input_text, response):
+        calls["n"] += 1
+        if calls["n"] == 150:
+            raise ValueError("grader crashed")
+        return 7.0
+
+    runner = ExperimentRunner(tester, LocalStubBackend(), grader=grader,
+                              max_concurrency=8, batch_size=64)
+    summary = runner.run_sync("runner", [f"input {i}" for i in range(200)])
+
+    assert summary["completed"] == 399
+    assert summary["failed"] == 1
+    assert summary["errors"] == ["grader: grader crashed"]
+    assert len(PromptABTester().results) == 399  # everything graded was saved
+
+def test_cache_is_used_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = PromptABTester()
+    tester.create_test("cached", "Prompt A", "Prompt B", "quality", "Cache test")
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    loop_thread = threading.get_ident()
+    threads = set()
+    original_get = cache.get
+
+    def get(*args):
+        threads.add(threading.get_ident())
+        return original_get(*args)
+    cache.get = get
+
+    inputs = [f"input {i}" for i in range(20)]
+    first = ExperimentRunner(tester, LocalStubBackend(), cache=cache).run_sync("cached", inputs)
+    second = ExperimentRunner(tester, LocalStubBackend(), cache=cache).run_sync("cached", inputs)
+    cache.close()
+
+    assert (first["cache_hits"], second["cache_hits"]) == (0, 40)
+    assert threads and loop_thread not in threads
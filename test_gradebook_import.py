@@ -0,0 +1,66 @@
+"""
+Test the gradebook importer
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from cohort_store import CohortProgressStore
+from gradebook_import import GradebookImporter
+
+def test_non_object_jsonl_rows_are_rejected(tmp_path):
+    export = tmp_path / "grades.jsonl"
+    export.write_text(
+        '{"student_id": "s1", "week": "week1_foundations", "kind": "skill", "name": "clear_framework", "score": 0.9}\n'
+        '42\n'
+        '[1]\n'
+        '{"student_id": "s2", "week": "week1_foundations", "kind": "skill", "name": "clear_framework", "score": 0.5}\n'
+    )
+    store = CohortProgressStore(str(tmp_path / "cohort.sqlite"))
+    summary = GradebookImporter(store).import_file(str(export))
+
+    assert summary["applied"] == 2
+    assert summary["rejected"] == 2
+    assert [r["line"] for r in summary["rejects"]] == [2, 3]
+    assert all(r["reason"] == "row is not a JSON object" for r in summary["rejects"])
+    assert store.load("s1")["skills_matrix"]["week1_foundations"]["clear_framework"] == 0.9
+    assert store.load("s2") is not None
+
+def test_stored_student_missing_template_skill(tmp_path):
+    store = CohortProgressStore(str(tmp_path / "cohort.sqlite"))
+    store.save("s1", {
+        'student_name': "Old Record",
+        'last_updated': "2026-01-01T00:00:00",
+        'skills_matrix': {"week1_foundations": {"prompt_debugging": 0.8}},  # saved by an older course version
+        'assessments': {},
+        'projects': {}
+    })
+    rows = [
+        (2, {"student_id": "s1", "week": "week1_foundations", "kind": "skill", "name": "clear_framework", "score": "0.7"}),
+        (3, {"student_id": "s1", "week": "week3_agents", "kind": "skill", "name": "tool_integration", "score": "0.6"})
+    ]
+    summary = GradebookImporter(store).import_rows(rows)
+
+    assert summary["applied"] == 2
+    skills = store.load("s1")["skills_matrix"]
+    assert skills["week1_foundations"]["prompt_debugging"] == 0.8
+    assert skills["week1_foundations"]["clear_framework"] == 0.7
+    assert skills["week3_agents"]["tool_integration"] == 0.6
+
+def test_non_text_fields_and_non_object_details_are_rejected(tmp_path):
+    store = CohortProgressStore(str(tmp_path / "cohort.sqlite"))
+    good = {"student_id": "s1", "week": "week1_foundations", "kind": "assessment", "name": "quiz", "score": 0.8}
+    rows = [
+        (2, dict(good, week=["x"])),
+        (3, dict(good, name={"a": 1})),
+        (4, dict(good, student_id=[1])),
+        (5, dict(good, details="[1, 2]")),
+        (6, dict(good, details='{"attempts": 2}'))
+    ]
+    summary = GradebookImporter(store).import_rows(rows)
+
+    assert summary["applied"] == 1
+    assert [r["reason"] for r in summary["rejects"]] == [
+        "week must be text", "name must be text", "student_id must be text", "details is not a JSON object"]
+    assert store.load("s1")["assessments"]["week1_foundations"]["quiz"]["details"] == {"attempts": 2}
@@ -0,0 +1,72 @@
+"""
+Test metric recording and export
+"""
+
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+import instrumentation
+
+@pytest.fixture
+def metrics():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.reset()
+    (instrumentation.enable if was_enabled else instrumentation.disable)()
+
+@instrumentation.timed("demo_call")
+def demo_call(x):
+    return x * 2
+
+def test_disabled_records_nothing(metrics):
+    metrics.disable()
+    assert demo_call(2) == 4
+    metrics.observe("latency_seconds", 0.1)
+    metrics.count("requests_total")
+    metrics.record_write("store", 100)
+    snap = metrics.snapshot()
+    assert (snap["histograms"], snap["counters"], snap["gauges"]) == ({}, {}, {})
+    assert metrics.export_prometheus() == "\n"
+
+def test_prometheus_export(metrics):
+    metrics.enable()
+    for _ in range(3):
+        demo_call(1)
+    metrics.observe("latency_seconds", 0.003)
+    metrics.observe("latency_seconds", 20.0)
+    metrics.record_write("store", 100)
+    metrics.record_write("store", 50)
+    lines = metrics.export_prometheus().splitlines()
+
+    assert "# HELP demo_call_seconds Latency of demo_call" in lines
+    assert "# TYPE demo_call_seconds histogram" in lines
+    assert 'demo_call_seconds_bucket{le="+Inf"} 3' in lines
+    assert "demo_call_seconds_count 3" in lines
+    assert 'latency_seconds_bucket{le="0.0025"} 0' in lines
+    assert 'latency_seconds_bucket{le="0.005"} 1' in lines
+    assert 'latency_seconds_bucket{le="10.0"} 1' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "latency_seconds_sum 20.003" in lines
+    assert ["# TYPE store_bytes_written_total counter", "store_bytes_written_total 150"] == \
+        lines[lines.index("# TYPE store_bytes_written_total counter"):][:2]
+    assert "store_file_size_bytes 50" in lines
+
+def test_json_export_and_reset(metrics, tmp_path):
+    metrics.enable()
+    demo_call(1)
+    metrics.count("requests_total", 2)
+    path = str(tmp_path / "metrics.json")
+    exported = json.loads(metrics.export_json(path))
+    with open(path) as f:
+        assert json.load(f) == exported
+    assert exported["counters"] == {"requests_total": 2}
+    assert exported["histograms"]["demo_call_seconds"]["count"] == 1
+
+    metrics.reset()
+    metrics.observe("demo_call_seconds", 0.1)  # recreated without help text
+    assert "# HELP" not in metrics.export_prometheus()
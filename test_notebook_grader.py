@@ -0,0 +1,74 @@
+"""
+Test the batch notebook grader
+"""
+
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from notebook_grader import NotebookGrader, extract_prompts
+from progress_tracker import ProgressTracker
+
+GOOD_PROMPT = ("You are a productivity coach. Write a 600-word blog post for remote managers "
+               "who struggle with meetings. Must include 3 tips, for example time-boxing.")
+
+def _notebook(*sources):
+    cells = [{"cell_type": "markdown", "source": ["challenge_prompt = 'not code'"]}]
+    cells += [{"cell_type": "code", "source": source} for source in sources]
+    return {"cells": cells}
+
+def _write(path, notebook):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(notebook, f)
+
+def test_extract_prompts():
+    notebook = _notebook(
+        ["%matplotlib inline\n", "!pip install openai\n",
+         'improved_prompt_1 = """\n# Write your improved prompt here\nHelp me plan a trip\n"""\n'],
+        'context = "You are a travel agent."\naudience = "For families with kids."\n'
+        'final_prompt = f"{context}\\n{audience}\\nPlan a week in Rome."\n',
+        'improved_prompt_1 = """\n# Try again below\n"""\n',  # an empty retry keeps the earlier answer
+        'challenge_prompt = "unterminated\n',
+        'learning_prompt = "first"\nlearning_prompt = "second"\n'
+        'social_media_prompt = some_function()\n'
+    )
+    prompts, unparsed = extract_prompts(notebook)
+    assert prompts == {
+        "improved_prompt_1": "Help me plan a trip",
+        "final_prompt": "You are a travel agent.\nFor families with kids.\nPlan a week in Rome.",
+        "learning_prompt": "second"
+    }
+    assert unparsed == 1
+
+def test_resume_and_retry_failed_notebooks(tmp_path):
+    submissions = tmp_path / "submissions"
+    _write(str(submissions / "bob.ipynb"), _notebook(f"challenge_prompt = {GOOD_PROMPT!r}\n"))
+    _write(str(submissions / "section" / "alice" / "foundations_lab.ipynb"),
+           _notebook(f"improved_prompt_1 = {GOOD_PROMPT!r}\n"))
+    (submissions / "broken.ipynb").write_text("{not json")
+    grader = NotebookGrader(str(tmp_path / "manifest.jsonl"), progress_dir=str(tmp_path), workers=1)
+
+    first = grader.grade_directory(str(submissions))
+    assert (first["notebooks"], first["graded"], first["failed"], first["skipped"]) == (3, 2, 1, 0)
+    assert first["failures"][0]["path"] == "broken.ipynb"
+    alice = ProgressTracker("section/alice", progress_file=str(tmp_path / "section__alice_progress.json"))
+    assert alice.skills_matrix["week1_foundations"]["prompt_debugging"] > 0
+    bob = ProgressTracker("bob", progress_file=str(tmp_path / "bob_progress.json"))
+    assert "challenge_500" in bob.assessments["week1_foundations"]
+
+    second = grader.grade_directory(str(submissions))  # only the failed notebook is retried
+    assert (second["graded"], second["failed"], second["skipped"]) == (0, 1, 2)
+
+    _write(str(submissions / "broken.ipynb"), _notebook(f"learning_prompt = {GOOD_PROMPT!r}\n"))
+    _write(str(submissions / "bob.ipynb"), _notebook(f"challenge_prompt = {GOOD_PROMPT + ' Use bullet points.'!r}\n"))
+    third = grader.grade_directory(str(submissions))
+    assert (third["graded"], third["failed"], third["skipped"]) == (2, 0, 1)
+
+    manifest = grader.load_manifest()
+    assert {path: entry["status"] for path, entry in manifest.items()} == {
+        "bob.ipynb": "graded", "broken.ipynb": "graded",
+        os.path.join("section", "alice", "foundations_lab.ipynb"): "graded"
+    }
+    assert manifest[os.path.join("section", "alice", "foundations_lab.ipynb")]["student_id"] == "section/alice"
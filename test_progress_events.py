@@ -0,0 +1,84 @@
+"""
+Test that incremental progress views match a full rescan
+"""
+
+import copy
+import datetime
+import os
+import random
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+from progress_events import ProgressEventLog, ProgressView
+from progress_tracker import SKILLS_MATRIX_TEMPLATE, ProgressTracker
+
+def rescan_progress(skills_matrix, assessments, projects):
+    """The original full-rescan get_overall_progress / _get_next_milestone"""
+    total_skills = sum(len(skills) for skills in skills_matrix.values())
+    completed_skills = sum(sum(1 for score in skills.values() if score >= 0.7) for skills in skills_matrix.values())
+    completed_projects = len([p for p in projects.values() if p['status'] == 'completed'])
+    overall = (completed_skills / total_skills + len(assessments) / 4 + completed_projects / 4) / 3
+    milestone = "Ready for advanced projects!"
+    for week, skills in skills_matrix.items():
+        if sum(1 for score in skills.values() if score >= 0.7) / len(skills) < 0.8:
+            milestone = f"Focus on {week.replace('_', ' ').title()}"
+            break
+    return {
+        'overall_progress': round(overall * 100, 1),
+        'skills_mastered': f"{completed_skills}/{total_skills}",
+        'assessments_completed': f"{len(assessments)}/4",
+        'projects_completed': f"{completed_projects}/4",
+        'next_milestone': milestone
+    }
+
+def fresh_view(tracker):
+    view = ProgressView(copy.deepcopy(tracker.skills_matrix), copy.deepcopy(tracker.assessments),
+                        copy.deepcopy(tracker.projects))
+    view.rebuild()
+    return view
+
+def test_incremental_view_matches_rebuild_and_replay(tmp_path):
+    rng = random.Random(34)
+    log = ProgressEventLog(str(tmp_path / "events.jsonl"))
+    tracker = ProgressTracker("Ana", progress_file=str(tmp_path / "progress.json"), event_log=log)
+    checkpoints = []
+
+    for step in range(300):
+        kind = rng.random()
+        week = rng.choice(list(SKILLS_MATRIX_TEMPLATE))
+        if kind < 0.8:
+            tracker.update_skill(week, rng.choice(list(SKILLS_MATRIX_TEMPLATE[week])), rng.choice([0.3, 0.69, 0.7, 0.9, 1.0]))
+        elif kind < 0.9:
+            tracker.record_assessment(week, rng.choice(["quiz", "challenge"]), rng.random())
+        else:
+            tracker.complete_project(f"project_{rng.randint(1, 5)}", "Demo project")
+
+        expected = rescan_progress(tracker.skills_matrix, tracker.assessments, tracker.projects)
+        assert tracker.get_overall_progress() == expected
+        assert fresh_view(tracker).summary() == expected
+        if step % 25 == 0:
+            checkpoints.append((datetime.datetime.now().isoformat(), expected))
+
+    for until, expected in checkpoints:
+        assert log.replay(SKILLS_MATRIX_TEMPLATE, "Ana", until=until).summary() == expected
+    assert log.replay(SKILLS_MATRIX_TEMPLATE, "Ana").summary() == tracker.get_overall_progress()
+
+def test_replay_requires_student_id(tmp_path):
+    log = ProgressEventLog(str(tmp_path / "events.jsonl"))
+    log.append("ana", "skill", week="week1_foundations", skill="clear_framework", score=0.9)
+    with pytest.raises(ValueError):
+        log.replay(SKILLS_MATRIX_TEMPLATE, None)
+
+def test_append_after_torn_line_keeps_log_readable(tmp_path):
+    log = ProgressEventLog(str(tmp_path / "events.jsonl"))
+    log.append("ana", "skill", week="week1_foundations", skill="clear_framework", score=0.9)
+    with open(log.path, "a") as f:  # the writer crashed mid-event
+        f.write('{"student_id":"ana","type":"ski')
+    log.append("ana", "skill", week="week1_foundations", skill="prompt_debugging", score=0.8)
+
+    events = list(log.read("ana"))
+    assert [e["skill"] for e in events] == ["clear_framework", "prompt_debugging"]
+    skills = log.replay(SKILLS_MATRIX_TEMPLATE, "ana").skills_matrix["week1_foundations"]
+    assert (skills["clear_framework"], skills["prompt_debugging"]) == (0.9, 0.8)
@@ -0,0 +1,85 @@
+"""
+Test the command-line interface
+"""
+
+import dataclasses
+import io
+import json
+import os
+import subprocess
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+import prompt_cli
+from prompt_version_control import PromptVersionControl
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_cli.py")
+
+def run(capsys, *argv):
+    code = prompt_cli.main(["--json", *argv])
+    return code, json.loads(capsys.readouterr().out)
+
+def test_validate(capsys, monkeypatch):
+    code, result = run(capsys, "validate", "You are a chef. Write a 200-word recipe for beginners.")
+    assert code == 0
+    assert 0 <= result["overall_score"] <= 100 and result["grade"]
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("Explain DNS to a child"))
+    code, piped = run(capsys, "validate", "-")
+    assert code == 0 and "breakdown" in piped
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("  \n"))
+    assert prompt_cli.main(["validate"]) == 2
+    assert "no prompt given" in capsys.readouterr().err
+
+def test_version_commands(capsys, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    vc = PromptVersionControl("CLI Project")
+    first = vc.create_version("Write about dogs", "Initial", "Sam")
+    vc.versions["v_second"] = dataclasses.replace(vc.versions[first], version_id="v_second",
+                                                  prompt_text="Write about cats")
+    vc.save_project()
+
+    code, history = run(capsys, "version", "-p", "CLI Project", "log")
+    assert code == 0 and {v["version_id"] for v in history} == {first, "v_second"}
+    code, comparison = run(capsys, "version", "-p", "CLI Project", "diff", first, "v_second")
+    assert code == 0 and comparison["word_diff"]["added"] == ["cats"]
+    code, rolled = run(capsys, "version", "-p", "CLI Project", "rollback", "v_second")
+    assert code == 0 and rolled["current_version"] == "v_second"
+    code, missing = run(capsys, "version", "-p", "CLI Project", "rollback", "v_missing")
+    assert code == 1 and not missing["rolled_back"]
+    code, branch = run(capsys, "version", "-p", "CLI Project", "branch", "experiment")
+    assert code == 0 and branch == {"created": True, "branch": "experiment", "version": "v_second"}
+
+def test_abtest_commands(capsys, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    code, test = run(capsys, "abtest", "create", "cli_test", "--prompt-a", "Short", "--prompt-b", "Long")
+    assert code == 0 and test["test_id"] == "cli_test"
+    for version, score in [("A", 6), ("B", 8), ("A", 7), ("B", 9)]:
+        assert run(capsys, "abtest", "record", "cli_test", version, str(score))[0] == 0
+    code, analysis = run(capsys, "abtest", "analyze", "cli_test")
+    assert code == 0 and analysis["test_id"] == "cli_test"
+    code, tests = run(capsys, "abtest", "list")
+    assert code == 0 and tests[0]["results_count"] == 4
+    code, error = run(capsys, "abtest", "record", "missing", "A", "5")
+    assert code == 1 and "error" in error
+
+def test_progress_commands(capsys, tmp_path):
+    path = str(tmp_path / "progress.json")
+    code, updated = run(capsys, "progress", "--file", path, "update", "week1_foundations", "clear_framework", "0.9")
+    assert code == 0 and updated["updated"] and updated["skills_mastered"].startswith("1/")
+    code, shown = run(capsys, "progress", "--file", path, "show")
+    assert code == 0 and shown["skills_mastered"] == updated["skills_mastered"]
+    code, report = run(capsys, "progress", "--file", path, "report")
+    assert report["skills_matrix"]["week1_foundations"]["clear_framework"] == 0.9
+    assert run(capsys, "progress", "--file", path, "update", "week1_foundations", "juggling", "0.9")[0] == 1
+
+def test_closed_pipe_exits_quietly(tmp_path):
+    process = subprocess.Popen([sys.executable, CLI, "progress", "--file", str(tmp_path / "p.json"), "report"],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=tmp_path)
+    process.stdout.close()  # like `| head -0`
+    stderr = process.stderr.read()
+    assert process.wait(timeout=60) == 1
+    assert b"BrokenPipeError" not in stderr and b"Traceback" not in stderr
@@ -0,0 +1,37 @@
+"""
+Test the prompt serving handle
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from prompt_serving import PromptServingHandle
+from prompt_version_control import PromptVersionControl
+
+def test_handle_sees_stale_writer(tmp_path, monkeypatch):
+    """A writer that loaded the project before another one saved must not hide its head"""
+    monkeypatch.chdir(tmp_path)
+    PromptVersionControl("Serving").create_version("initial", "Initial", "Test User")
+
+    writer_a = PromptVersionControl("Serving")
+    writer_b = PromptVersionControl("Serving")  # opened before A saves, so it is stale
+    handle = PromptServingHandle("Serving")
+
+    writer_a.create_version("from A", "A", "Test User")
+    assert handle.get_current_prompt("main") == "from A"
+
+    writer_b.create_version("from B", "B", "Test User")
+    assert handle.get_current_prompt("main") == "from B"
+    assert handle.get_current_prompt() == "from B"
+
+def test_handle_skips_reload_when_heads_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    vc = PromptVersionControl("Serving")
+    vc.create_version("v1", "Initial", "Test User")
+    handle = PromptServingHandle("Serving")
+    reloads = handle.reloads
+
+    vc.update_performance_metrics(vc.current_version, {"avg_score": 8.0})
+    assert handle.get_current_prompt("main") == "v1"
+    assert handle.reloads == reloads
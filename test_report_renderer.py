@@ -0,0 +1,50 @@
+"""
+Test cohort report rendering
+"""
+
+import os
+import sys
+import zipfile
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from progress_tracker import ProgressTracker
+from report_renderer import render_cohort
+
+def _tracker(tmp_path, name="Ana"):
+    tracker = ProgressTracker(name, progress_file=str(tmp_path / f"{name}.json"))
+    for skill in tracker.skills_matrix["week1_foundations"]:
+        tracker.update_skill("week1_foundations", skill, 0.9)
+    tracker.update_skill("week2_advanced", "chain_of_thought", 0.75)
+    return tracker
+
+def test_batch_output_matches_tracker_reports(tmp_path):
+    tracker = _tracker(tmp_path)
+    output_dir = tmp_path / "reports"
+    stats = render_cohort([("ana", tracker.progress_data())], output_dir=str(output_dir), workers=1)
+
+    student_dir = output_dir / "ana"
+    assert stats["students"] == 1
+    assert sorted(os.listdir(student_dir)) == ["certificate_week1_foundations.txt", "skill_report.txt"]
+    assert (student_dir / "skill_report.txt").read_text() == tracker.generate_skill_report()
+    assert (student_dir / "certificate_week1_foundations.txt").read_text() == \
+        tracker.generate_certificate("week1_foundations")
+
+def test_student_ids_cannot_escape_output_dir_or_collide(tmp_path):
+    data = _tracker(tmp_path).progress_data()
+    ids = ["ana", "section/bob", "section__bob", "../evil", "..", "ANA"]
+    output_dir = tmp_path / "reports"
+    stats = render_cohort([(i, data) for i in ids], output_dir=str(output_dir), workers=1)
+
+    assert stats["students"] == 4
+    assert stats["rejected_ids"] == ["..", "ANA"]
+    assert sorted(os.listdir(output_dir)) == ["..%2Fevil", "ana", "section%2Fbob", "section__bob"]
+    assert not (tmp_path / "evil").exists()
+
+def test_archive_members_use_escaped_ids(tmp_path):
+    data = _tracker(tmp_path).progress_data()
+    archive_path = str(tmp_path / "reports.zip")
+    render_cohort([(i, data) for i in ("section/bob", "section__bob", "..\\evil")],
+                  archive_path=archive_path, workers=1)
+    with zipfile.ZipFile(archive_path) as archive:
+        folders = {name.split("/")[0] for name in archive.namelist()}
+    assert folders == {"section%2Fbob", "section__bob", "..%5Cevil"}
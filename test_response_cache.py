@@ -0,0 +1,56 @@
+"""
+Test the persistent response cache
+"""
+
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+from response_cache import ResponseCache
+
+def test_hits_misses_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with ResponseCache(path) as cache:
+        assert cache.get("Summarize", "Ticket 1", {"temperature": 0}) is None
+        cache.put("Summarize", "Ticket 1", "Login fails.", {"temperature": 0})
+        assert cache.get("Summarize", "Ticket 1", {"temperature": 0}) == "Login fails."
+        assert cache.get("Summarize", "Ticket 1", {"temperature": 1}) is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 0.333)
+
+    with ResponseCache(path) as cache:
+        assert cache.get("Summarize", "Ticket 1", {"temperature": 0}) == "Login fails."
+        assert cache.get_stats()["total_bytes"] == len("Login fails.")
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    with ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=300) as cache:
+        for name in ("a", "b", "c"):
+            cache.put("p", name, name * 100)
+        assert cache.get("p", "a") == "a" * 100  # now more recent than b
+        cache.put("p", "d", "d" * 100)
+
+        assert cache.get("p", "b") is None
+        assert [cache.get("p", name) is not None for name in ("a", "c", "d")] == [True] * 3
+        stats = cache.get_stats()
+        assert (stats["evictions"], stats["entries"], stats["total_bytes"]) == (1, 3, 300)
+
+def test_concurrent_puts_of_one_key_keep_total_bytes_exact(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    caches = [ResponseCache(path) for _ in range(4)]
+
+    def store(cache, worker):
+        for i in range(100):
+            cache.put("p", "shared", "x" * (worker * 100 + i))
+
+    threads = [threading.Thread(target=store, args=(cache, w)) for w, cache in enumerate(caches)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = caches[0].get_stats()
+    assert stats["entries"] == 1
+    assert stats["total_bytes"] == len(caches[0].get("p", "shared"))
+    for cache in caches:
+        cache.close()
@@ -0,0 +1,80 @@
+"""
+Test multi-process result ingestion
+"""
+
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+import codec
+from ab_testing_framework import PromptABTester
+from result_ingest import RESULT_FIELDS, ResultIngestionService, ResultLog
+
+def test_bad_record_is_rejected_and_the_rest_kept(tmp_path):
+    log_path = str(tmp_path / "results.jsonl")
+    service = ResultIngestionService(log_path, flush_interval=0.01)
+    with service.submitter() as submitter:
+        for i in range(20):
+            submitter.submit("ingest", "AB"[i % 2], 5.0,
+                             attributes={"tags": {1, 2}} if i == 7 else {"tier": "pro"})
+    assert service.close() == 19
+    assert len(ResultLog(log_path).snapshot("ingest")) == 19
+
+def test_rejections_are_reported(tmp_path):
+    service = ResultIngestionService(str(tmp_path / "results.jsonl"), flush_interval=0.01)
+    with service.submitter() as submitter:
+        submitter.submit("ingest", "A", 5.0, attributes={"tags": {1}})
+    while service.written() + service.rejected() < 1:  # wait for the writer
+        time.sleep(0.01)
+    assert service.rejected() == 1
+    assert service.last_error.startswith("TypeError")
+    assert service.close() == 0
+
+def test_close_raises_when_the_writer_died(tmp_path):
+    service = ResultIngestionService(str(tmp_path / "results.jsonl"))
+    service._process.kill()
+    service._process.join()
+    with pytest.raises(RuntimeError):
+        service.close()
+
+def test_torn_tail_is_cut_before_the_next_append(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = ResultLog(str(tmp_path / "results.jsonl"))
+    log.append([{"test_id": "t", "prompt_version": "A", "score": 5.0,
+                 "response_text": None, "timestamp": "2024-01-01"}])
+    with open(log.path, "ab") as f:  # the writer was killed mid-line
+        f.write(b'{"test_id": "t", "prompt_ver')
+    assert len(log.snapshot()) == 1
+
+    tester = PromptABTester(result_log=ResultLog(log.path))
+    tester.record_result("t", "B", 7.0, "response")
+    with open(log.path, "ab") as f:  # a damaged line in the middle is skipped
+        f.write(b"not json\n")
+    tester.record_result("t", "A", 6.0, "response")
+    assert [r.score for r in ResultLog(log.path).snapshot()] == [5.0, 7.0, 6.0]
+    assert len(PromptABTester(result_log=ResultLog(log.path)).results) == 3
+
+def test_legacy_results_are_migrated_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = PromptABTester()
+    tester.create_test("legacy", "Prompt A", "Prompt B", "quality", "Legacy test")
+    for i in range(10):
+        tester.record_result("legacy", "AB"[i % 2], 5.0, f"response {i}")
+
+    barrier = threading.Barrier(8)
+    def open_tester():
+        barrier.wait()
+        PromptABTester(result_log=ResultLog("results.jsonl"))
+    threads = [threading.Thread(target=open_tester) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(ResultLog("results.jsonl").snapshot("legacy")) == 10
+    assert codec.load("ab_test_data.json")["results"] == []
+    assert "legacy" in PromptABTester(result_log=ResultLog("results.jsonl")).tests
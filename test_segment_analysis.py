@@ -0,0 +1,30 @@
+"""
+Test segmented A/B analysis
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import ab_testing_framework
+from segment_analysis import ResultColumns, analyze_segments, t_p_value
+
+def _result(version, score, **attributes):
+    return ab_testing_framework.TestResult("seg", version, score, None, "", attributes=attributes)
+
+def test_group_ids_stay_dense_for_high_cardinality_dimensions():
+    # 3000 x 3001 x 997 label combinations would overflow a 32-bit combined code
+    results = [_result("AB"[i % 2], 5.0, user=f"u{i}", session=f"s{i}", page=f"p{i % 997}")
+               for i in range(3001)]
+    columns = ResultColumns(results, "seg", ["user", "session", "page"])
+    groups, keys = columns.group_codes()
+    assert max(groups) == len(keys) - 1 == 3000
+    assert columns.group_label(keys[5]) == {"user": "u5", "session": "s5", "page": "p5"}
+
+def test_small_segments_use_t_distribution():
+    assert abs(t_p_value(2.0, 3) - 0.1393) < 1e-4
+    results = [_result("A", s, tier="pro") for s in (5.0, 6.0, 7.0)] + \
+              [_result("B", s, tier="pro") for s in (7.0, 8.0, 9.5)]
+    segment = analyze_segments(results, "seg", ["tier"])["segments"][0]
+    assert segment["p_value"] > 0.05  # the normal approximation gives ~0.02 here
+    assert not segment["significant"]
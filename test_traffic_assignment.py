@@ -0,0 +1,69 @@
+"""
+Test deterministic traffic assignment
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+from ab_testing_framework import PromptABTester
+from traffic_assignment import ExperimentLayer, assign_bulk, assign_variant
+
+USERS = [f"user_{i}" for i in range(20000)]
+
+def test_assignment_is_sticky_and_balanced():
+    first = assign_bulk("sticky_test", USERS)
+    assert assign_bulk("sticky_test", USERS) == first
+    assert [assign_variant("sticky_test", u) for u in USERS[:500]] == first[:500]
+    assert abs(first.count("A") / len(USERS) - 0.5) < 0.02
+    assert assign_bulk("sticky_test", USERS, salt="rerun") != first  # a new salt reshuffles
+
+def test_ramping_traffic_only_adds_units():
+    at_10 = assign_bulk("ramp_test", USERS, traffic=0.1)
+    at_50 = assign_bulk("ramp_test", USERS, traffic=0.5)
+    full = assign_bulk("ramp_test", USERS, traffic=1.0)
+    assert abs(sum(a is not None for a in at_10) / len(USERS) - 0.1) < 0.01
+    assert abs(sum(a is not None for a in at_50) / len(USERS) - 0.5) < 0.02
+    for low, high, all_in in zip(at_10, at_50, full):
+        if low is not None:
+            assert high == low
+        if high is not None:
+            assert all_in == high
+
+def test_layer_experiments_are_mutually_exclusive():
+    layer = ExperimentLayer("onboarding")
+    assert layer.add_experiment("welcome_test", 0.3)
+    assert layer.add_experiment("tooltip_test", 0.3, {"A": 1, "B": 1, "C": 1})
+    assert not layer.add_experiment("too_big", 0.5)
+    assert abs(layer.remaining_share() - 0.4) < 1e-9
+
+    assignments = layer.assign_bulk(USERS)
+    counts = {}
+    for assignment in assignments:
+        test_id = assignment[0] if assignment else None
+        counts[test_id] = counts.get(test_id, 0) + 1
+    assert abs(counts["welcome_test"] / len(USERS) - 0.3) < 0.02
+    assert abs(counts["tooltip_test"] / len(USERS) - 0.3) < 0.02
+    assert abs(counts[None] / len(USERS) - 0.4) < 0.02
+    assert layer.assign_bulk(USERS) == assignments
+
+def test_get_assigned_prompt_rejects_unknown_arms(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = PromptABTester()
+    tester.create_test("arms", "Prompt A", "Prompt B", "quality", "Arms test")
+    assert tester.get_assigned_prompt("arms", "user_1", weights={"A": 1, "B": 0}) == ("A", "Prompt A")
+    with pytest.raises(ValueError):
+        tester.get_assigned_prompt("arms", "user_1", weights={"A": 1, "C": 1})
+
+def test_empty_experiment_does_not_take_the_next_ones_traffic():
+    layer = ExperimentLayer("zero_share")
+    assert layer.add_experiment("b_real", 0.5)
+    assert layer.add_experiment("z_empty", 0.0)
+    assert layer.add_experiment("c_next", 0.5)
+    assignments = layer.assign_bulk(USERS)
+    test_ids = [a[0] if a else None for a in assignments]
+    assert test_ids.count("z_empty") == 0
+    assert test_ids.count(None) == 0
+    assert abs(test_ids.count("c_next") / len(USERS) - 0.5) < 0.02
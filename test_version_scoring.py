@@ -0,0 +1,78 @@
+"""
+Test background scoring of prompt versions
+"""
+
+import dataclasses
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks'))
+
+import pytest
+
+import version_scoring
+from prompt_validator import PromptValidator
+from prompt_version_control import PromptVersionControl
+from version_scoring import VALIDATOR_SCORE, VersionScorer
+
+TEXTS = ["Write about dogs",
+         "You are a vet. Write 200 words about dog nutrition for new owners. Must include feeding amounts."]
+
+def _project(name):
+    vc = PromptVersionControl(name)
+    for i, text in enumerate(TEXTS):
+        vc.create_version(text, f"Version {i}", "Sam")
+    first = vc.versions[min(vc.versions)]
+    vc.versions["v_copy"] = dataclasses.replace(first, version_id="v_copy")  # same text, new id
+    return vc
+
+def _count_saves(vc):
+    saves = []
+    original = vc.save_project
+    def save_project():
+        saves.append(1)
+        original()
+    vc.save_project = save_project
+    return saves
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_scores_are_deduplicated_and_saved_once(tmp_path, monkeypatch, processes):
+    monkeypatch.chdir(tmp_path)
+    vc = _project("Scoring Test")
+    saves = _count_saves(vc)
+    with VersionScorer(max_workers=2, processes=processes, save_delay=60) as scorer:
+        assert scorer.score_missing(vc) == 3
+        assert scorer.wait(timeout=30)
+        assert scorer.pending == 0
+        assert scorer.scored == 2  # the copied text was scored once
+        assert len(saves) == 1  # one coalesced save, not one per version
+
+    expected = {text: PromptValidator().score_prompt(text)['overall_score'] for text in TEXTS}
+    reloaded = PromptVersionControl("Scoring Test")
+    assert len(reloaded.versions) == 3
+    for version in reloaded.versions.values():
+        assert version.performance_metrics[VALIDATOR_SCORE] == expected[version.prompt_text]
+
+def test_known_texts_are_not_rescored(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with VersionScorer(save_delay=0.01) as scorer:
+        vc = PromptVersionControl("Rescore Test", scorer=scorer)
+        vc.create_version(TEXTS[0], "First", "Sam")
+        scorer.wait()
+        other = PromptVersionControl("Other Project", scorer=scorer)
+        other.create_version(TEXTS[0], "Same text elsewhere", "Sam")
+        scorer.wait()
+        assert scorer.scored == 1
+        assert VALIDATOR_SCORE in other.get_version(other.current_version).performance_metrics
+
+def test_scoring_failures_are_counted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    def broken(prompt_text):
+        raise RuntimeError("validator is broken")
+    monkeypatch.setattr(version_scoring, "_score_text", broken)
+    with VersionScorer() as scorer:
+        vc = PromptVersionControl("Failing Test", scorer=scorer)
+        vc.create_version(TEXTS[0], "First", "Sam")
+        assert scorer.wait(timeout=10)
+        assert scorer.failed == 1
+        assert scorer.last_error == "RuntimeError: validator is broken"
+        assert VALIDATOR_SCORE not in (vc.get_version(vc.current_version).performance_metrics or {})
@@ -0,0 +1,55 @@
+"""
+Test write-behind progress saving
+"""
+
+import os
+import subprocess
+import sys
+import time
+NOTEBOOKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notebooks')
+sys.path.append(NOTEBOOKS)
+
+import codec
+from progress_tracker import ProgressTracker
+
+WEEK, SKILLS = "week1_foundations", ("prompt_debugging", "clear_framework", "context_setting")
+
+def _saved_skills(path):
+    return codec.load(path)["skills_matrix"][WEEK] if os.path.exists(path) else None
+
+def test_saves_after_flush_every_updates(tmp_path):
+    path = str(tmp_path / "progress.json")
+    tracker = ProgressTracker("Ana", write_behind=True, flush_every=3, flush_interval=3600, progress_file=path)
+    tracker.update_skill(WEEK, SKILLS[0], 0.9)
+    tracker.update_skill(WEEK, SKILLS[1], 0.8)
+    assert tracker.dirty and _saved_skills(path) is None
+    tracker.update_skill(WEEK, SKILLS[2], 0.7)
+    assert not tracker.dirty
+    assert [_saved_skills(path)[s] for s in SKILLS] == [0.9, 0.8, 0.7]
+
+def test_saves_after_flush_interval(tmp_path):
+    path = str(tmp_path / "progress.json")
+    tracker = ProgressTracker("Ana", write_behind=True, flush_every=1000, flush_interval=0.05, progress_file=path)
+    tracker.update_skill(WEEK, SKILLS[0], 0.9)
+    deadline = time.monotonic() + 5
+    while tracker.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not tracker.dirty
+    assert _saved_skills(path)[SKILLS[0]] == 0.9
+
+def test_with_block_flushes(tmp_path):
+    path = str(tmp_path / "progress.json")
+    with ProgressTracker("Ana", write_behind=True, flush_interval=3600, progress_file=path) as tracker:
+        tracker.update_skill(WEEK, SKILLS[0], 0.9)
+        tracker.record_assessment(WEEK, "quiz", 0.8)
+        assert _saved_skills(path) is None
+    assert _saved_skills(path)[SKILLS[0]] == 0.9
+    assert codec.load(path)["assessments"][WEEK]["quiz"]["score"] == 0.8
+
+def test_interpreter_exit_flushes(tmp_path):
+    script = (f"import sys; sys.path.insert(0, {NOTEBOOKS!r})\n"
+              "from progress_tracker import ProgressTracker\n"
+              "tracker = ProgressTracker('Ana', write_behind=True, flush_interval=3600)\n"
+              f"tracker.update_skill({WEEK!r}, {SKILLS[0]!r}, 0.9)\n")
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, check=True, timeout=60)
+    assert _saved_skills(str(tmp_path / "progress.json"))[SKILLS[0]] == 0.9